@@ -0,0 +1,3 @@
+"""
+Szczecin Business Scraper
+"""
@@ -19,7 +19,13 @@ GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "")
 # Ustawienia requestów
 REQUEST_DELAY_MIN = float(os.getenv("REQUEST_DELAY_MIN", 2))
 REQUEST_DELAY_MAX = float(os.getenv("REQUEST_DELAY_MAX", 5))
+REQUEST_RATE = float(os.getenv("REQUEST_RATE", 10))  # żądań/s na serwis
+REQUEST_BURST = int(os.getenv("REQUEST_BURST", 20))
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 5))
+WEBSITE_CHECK_WORKERS = int(os.getenv("WEBSITE_CHECK_WORKERS", 32))  # równoległe sprawdzanie stron
+RESPECT_ROBOTS_TXT = os.getenv("RESPECT_ROBOTS_TXT", "true").lower() == "true"
 MAX_BUSINESSES = int(os.getenv("MAX_BUSINESSES", 100))
+MAX_SCAN_JOBS = int(os.getenv("MAX_SCAN_JOBS", 64))  # zadania trzymane w pamięci aplikacji webowej
 
 # Lokalizacja
 CITY = os.getenv("CITY", "Szczecin")
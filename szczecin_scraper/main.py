@@ -20,18 +20,18 @@ from typing import List, Dict, Set
 from datetime import datetime
 from tqdm import tqdm
 
-# Dodaj katalog główny do ścieżki
-sys.path.insert(0, str(Path(__file__).parent))
+# Dodaj katalog nadrzędny pakietu szczecin_scraper do ścieżki
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from config import (
-    INDUSTRIES, CITY, MAX_BUSINESSES, OUTPUT_FORMAT, OUTPUT_DIR
+from szczecin_scraper.config import (
+    INDUSTRIES, CITY, MAX_BUSINESSES, OUTPUT_FORMAT, OUTPUT_DIR, REQUEST_RATE
 )
-from scrapers.google_maps import GoogleMapsScraper
-from scrapers.panorama_firm import PanoramaFirmScraper
-from scrapers.pkt_scraper import PKTScraper
-from scrapers.website_checker import WebsiteChecker, has_no_website
-from utils.exporter import DataExporter
-from utils.helpers import random_delay
+from szczecin_scraper.scrapers.google_maps import GoogleMapsScraper
+from szczecin_scraper.scrapers.panorama_firm import PanoramaFirmScraper
+from szczecin_scraper.scrapers.pkt_scraper import PKTScraper
+from szczecin_scraper.scrapers.website_checker import WebsiteChecker, has_no_website
+from szczecin_scraper.utils.exporter import DataExporter
+from szczecin_scraper.utils.helpers import random_delay
 
 # Konfiguracja loggera
 logging.basicConfig(
@@ -173,28 +173,37 @@ class SzczecinBusinessScraper:
         """Weryfikuje strony www wszystkich firm."""
         logger.info(f"Weryfikuję {len(self.all_businesses)} stron...")
 
-        for i, business in enumerate(tqdm(self.all_businesses, desc="Weryfikacja")):
-            website = business.get("website", "")
-
-            if not website:
+        to_check = []
+        for business in self.all_businesses:
+            if business.get("website", ""):
+                to_check.append(business)
+            else:
                 business["has_website"] = False
-                continue
-
-            try:
-                status = self.website_checker.check_website(website)
-                business["has_website"] = status.is_active and status.is_company_site
 
-                # Jeśli strona nieaktywna, spróbuj wyciągnąć kontakty z innych źródeł
-                if not business["has_website"]:
-                    logger.debug(f"  Strona nieaktywna: {business['name']} - {website}")
-
-            except Exception as e:
-                logger.debug(f"  Błąd weryfikacji {website}: {e}")
-                business["has_website"] = False
+        if not to_check:
+            return
+
+        # Strony sprawdzane współbieżnie (asyncio); tempo ogranicza
+        # token bucket zamiast sztywnych przerw co kilka stron
+        try:
+            with tqdm(total=len(to_check), desc="Weryfikacja") as bar:
+                statuses = self.website_checker.batch_check(
+                    [business["website"] for business in to_check],
+                    rate=REQUEST_RATE,
+                    progress=bar.update
+                )
+        except Exception as e:
+            logger.error(f"  Błąd weryfikacji stron: {e}")
+            statuses = [None] * len(to_check)
+
+        for business, status in zip(to_check, statuses):
+            business["has_website"] = bool(
+                status and status.is_active and status.is_company_site
+            )
 
-            # Rate limiting
-            if i % 10 == 0:
-                random_delay(1, 2)
+            # Jeśli strona nieaktywna, spróbuj wyciągnąć kontakty z innych źródeł
+            if not business["has_website"]:
+                logger.debug(f"  Strona nieaktywna: {business['name']} - {business['website']}")
 
     def export_results(
         self,
@@ -234,6 +243,8 @@ class SzczecinBusinessScraper:
         for scraper in self.scrapers.values():
             if hasattr(scraper, 'close'):
                 scraper.close()
+        if self.website_checker:
+            self.website_checker.close()
 
 
 def main():
@@ -266,7 +277,7 @@ def main():
 
     parser.add_argument(
         "--output-format", "-f",
-        choices=["csv", "xlsx", "docx", "json"],
+        choices=["csv", "xlsx", "docx", "json", "parquet"],
         default="xlsx",
         help="Format wyjściowy (domyślnie: xlsx)"
     )
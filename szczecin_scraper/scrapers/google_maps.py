@@ -8,8 +8,9 @@ Alternatywnie, zawiera też wersję z Selenium do scrapowania bez API.
 """
 import logging
 import time
+from pathlib import Path
 from typing import List, Dict, Optional, Generator
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 
 try:
     import googlemaps
@@ -27,14 +28,41 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 
-import sys
-sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
-from config import GOOGLE_MAPS_API_KEY, CITY, REQUEST_DELAY_MIN, REQUEST_DELAY_MAX
-from utils.helpers import random_delay, clean_text
-from utils.validators import extract_emails, extract_phones, extract_social_media
+from szczecin_scraper.config import (
+    GOOGLE_MAPS_API_KEY, CITY, REQUEST_DELAY_MIN, REQUEST_DELAY_MAX
+)
+from szczecin_scraper.utils.helpers import (
+    random_delay, clean_text, TokenBucket,
+    make_dedup_key, load_seen_keys, save_seen_keys
+)
+from szczecin_scraper.utils.validators import (
+    extract_emails, extract_phones, extract_social_media
+)
 
 logger = logging.getLogger(__name__)
 
+# Wspólny limit zapytań do Places API dla wszystkich instancji scrapera
+_limiter = TokenBucket()
+
+# Google Place types -> branża (pierwszy pasujący typ wygrywa)
+_TYPE_MAPPING = {
+    'restaurant': 'Restauracja',
+    'cafe': 'Kawiarnia',
+    'lawyer': 'Kancelaria prawna',
+    'hair_care': 'Fryzjer',
+    'beauty_salon': 'Salon kosmetyczny',
+    'car_repair': 'Mechanik samochodowy',
+    'dentist': 'Dentysta',
+    'veterinary_care': 'Weterynarz',
+    'bakery': 'Piekarnia',
+    'florist': 'Kwiaciarnia',
+    'accounting': 'Biuro rachunkowe',
+    'real_estate_agency': 'Agencja nieruchomości',
+    'electrician': 'Elektryk',
+    'plumber': 'Hydraulik',
+}
+_TYPE_KEYS = frozenset(_TYPE_MAPPING)
+
 
 @dataclass
 class Business:
@@ -54,7 +82,12 @@ class Business:
     has_website: bool = True
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Płaskie pola - bez głębokiej kopii, którą robi asdict()
+        values = self.__dict__
+        return {name: values[name] for name in _BUSINESS_FIELDS}
+
+
+_BUSINESS_FIELDS = tuple(f.name for f in fields(Business))
 
 
 class GoogleMapsScraper:
@@ -66,16 +99,20 @@ class GoogleMapsScraper:
     2. Selenium Mode - scrapuje bezpośrednio stronę (ryzyko blokad)
     """
 
-    def __init__(self, use_api: bool = True):
+    def __init__(self, use_api: bool = True, seen_path: Optional[Path] = None):
         """
         Inicjalizuje scraper.
 
         Args:
             use_api: Czy użyć Google Places API (wymaga klucza)
+            seen_path: Plik z kluczami już widzianych firm (deduplikacja
+                między uruchomieniami); None = tylko w obrębie sesji
         """
         self.use_api = use_api and GOOGLE_MAPS_API_KEY and GOOGLEMAPS_AVAILABLE
         self.client = None
         self.driver = None
+        self.seen_path = seen_path
+        self._seen = load_seen_keys(seen_path)
 
         if self.use_api:
             try:
@@ -124,11 +161,13 @@ class GoogleMapsScraper:
                 # Text search
                 if next_page_token:
                     time.sleep(2)  # API wymaga przerwy przed użyciem tokena
+                    _limiter.acquire()
                     response = self.client.places(
                         query=query,
                         page_token=next_page_token
                     )
                 else:
+                    _limiter.acquire()
                     response = self.client.places(query=query)
 
                 places = response.get('results', [])
@@ -137,12 +176,17 @@ class GoogleMapsScraper:
                     if results_count >= max_results:
                         break
 
+                    # Pomiń miejsca już pobrane w innych zapytaniach
+                    key = make_dedup_key(place.get('place_id', ''))
+                    if key in self._seen:
+                        continue
+                    self._seen.add(key)
+
                     # Pobierz szczegóły miejsca
                     business = self._get_place_details(place)
                     if business:
                         yield business
                         results_count += 1
-                        random_delay(0.5, 1)  # Mniejsze opóźnienie dla API
 
                 # Sprawdź czy jest następna strona
                 next_page_token = response.get('next_page_token')
@@ -160,6 +204,7 @@ class GoogleMapsScraper:
                 return None
 
             # Pobierz pełne szczegóły
+            _limiter.acquire()
             details = self.client.place(
                 place_id=place_id,
                 fields=[
@@ -192,26 +237,9 @@ class GoogleMapsScraper:
 
     def _types_to_industry(self, types: List[str]) -> str:
         """Konwertuje Google Place types na branżę."""
-        type_mapping = {
-            'restaurant': 'Restauracja',
-            'cafe': 'Kawiarnia',
-            'lawyer': 'Kancelaria prawna',
-            'hair_care': 'Fryzjer',
-            'beauty_salon': 'Salon kosmetyczny',
-            'car_repair': 'Mechanik samochodowy',
-            'dentist': 'Dentysta',
-            'veterinary_care': 'Weterynarz',
-            'bakery': 'Piekarnia',
-            'florist': 'Kwiaciarnia',
-            'accounting': 'Biuro rachunkowe',
-            'real_estate_agency': 'Agencja nieruchomości',
-            'electrician': 'Elektryk',
-            'plumber': 'Hydraulik',
-        }
-
         for t in types:
-            if t in type_mapping:
-                return type_mapping[t]
+            if t in _TYPE_KEYS:
+                return _TYPE_MAPPING[t]
         return types[0] if types else 'Inne'
 
     def _search_with_selenium(
@@ -284,6 +312,11 @@ class GoogleMapsScraper:
 
                         processed_names.add(name)
 
+                        key = make_dedup_key(name)
+                        if key in self._seen:
+                            continue
+                        self._seen.add(key)
+
                         # Kliknij aby zobaczyć szczegóły
                         result.click()
                         random_delay(2, 3)
@@ -383,6 +416,7 @@ class GoogleMapsScraper:
 
     def close(self):
         """Zamyka zasoby."""
+        save_seen_keys(self._seen, self.seen_path)
         if self.driver:
             self.driver.quit()
             self.driver = None
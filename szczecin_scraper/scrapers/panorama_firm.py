@@ -6,18 +6,25 @@ Zawiera dane kontaktowe, adresy, i często informację o stronie www.
 """
 import logging
 import re
-from typing import Generator, Optional, List
-from urllib.parse import urljoin, quote
-from dataclasses import dataclass, asdict
-
-from bs4 import BeautifulSoup
-
-import sys
-sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
-from config import CITY
-from utils.helpers import make_request, random_delay, clean_text
-from utils.validators import (
-    extract_emails, extract_phones, extract_social_media,
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Dict, Generator, Optional, Union, List
+from urllib.parse import quote
+from urllib.robotparser import RobotFileParser
+from dataclasses import dataclass, field, fields
+
+from szczecin_scraper.config import CITY, MAX_CONCURRENT_REQUESTS
+from szczecin_scraper.utils.helpers import (
+    make_request, read_body, clean_text, slugify, abs_url, TokenBucket,
+    create_session, robots_allows,
+    make_dedup_key, load_seen_keys, save_seen_keys, crawl_to_csv
+)
+from szczecin_scraper.utils.html import (
+    parse, page_html, attr, contact_html, first_match
+)
+from szczecin_scraper.utils.validators import (
+    extract_emails, extract_phones, extract_social_media_from_tree,
     is_valid_website
 )
 
@@ -25,8 +32,44 @@ logger = logging.getLogger(__name__)
 
 BASE_URL = "https://panoramafirm.pl"
 
+# Liczba firm na pełnej stronie wyników - mniej oznacza ostatnią stronę
+PAGE_SIZE = 20
+
+# Wspólny limit żądań do panoramafirm.pl dla wszystkich instancji scrapera
+_limiter = TokenBucket()
 
-@dataclass
+# Selektory CSS - zdefiniowane raz dla całego modułu. Krotki to warianty
+# w kolejności priorytetu (sprawdzane po kolei, patrz first_match)
+_SEL_RESULT_LINKS = (
+    "a.addax-cs_hl_hit_company_name_click",
+    "a[href*='/firma/']",
+    "article a[href*='panoramafirm.pl'], div.company a",
+)
+_SEL_NEXT = "a[rel='next']"
+_SEL_NEXT_TEXT = 'a:lexbor-contains("Następna"), a:lexbor-contains("›")'
+_SEL_CARD_NAME = ("h2 a", "h3 a", ".company-name a", ".name a", "a[title]")
+_SEL_CARD_ADDR = (
+    ".address", ".company-address", "span[itemprop='address']", ".location"
+)
+_SEL_CARD_PHONE = (".phone", ".tel", "a[href^='tel:']", "span[itemprop='telephone']")
+_SEL_CARD_WWW = ("a.website", "a.www", "a[href*='http']:not([href*='panoramafirm'])")
+_SEL_EMAIL = "a[href^='mailto:']"
+_SEL_DETAILS_WWW = (
+    "a[data-stat-id='www']", "a.company-www", "a[rel='nofollow'][href^='http']"
+)
+_SEL_DETAILS_ADDR = ("address", ".address", "span[itemprop='streetAddress']")
+_SEL_COMPANIES = "div.company-item, article.item, div[itemtype*='LocalBusiness']"
+
+# Wszystkie pola kontaktowe strony profilu w jednym selektorze
+_PROFILE_CONTACT_SELECTOR = (
+    "[itemprop='address'], .address, address, "
+    "a[href^='tel:'], [itemprop='telephone'], "
+    "a[href^='mailto:'], "
+    "a[data-stat-id='www'], a.website, a[rel='nofollow'][href^='http']"
+)
+
+
+@dataclass(slots=True)
 class Business:
     """Reprezentacja firmy."""
     name: str
@@ -42,31 +85,76 @@ class Business:
     reviews_count: int = 0
     source: str = "panorama_firm"
     has_website: bool = True
+    profile_url: str = field(default="", repr=False)  # Strona firmy w katalogu
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Płaskie pola - bez głębokiej kopii, którą robi asdict()
+        return {f: getattr(self, f) for f in _PUBLIC_FIELDS}
+
+
+# Pola eksportowane w to_dict() - bez pól wewnętrznych (repr=False),
+# np. profile_url, więc rekord ma te same kolumny co w PKT
+_PUBLIC_FIELDS = tuple(f.name for f in fields(Business) if f.repr)
+
+# Dane kontaktowe, które profil firmy może uzupełnić
+_CONTACT_FIELDS = (
+    "address", "phone", "email", "website", "facebook", "instagram", "linkedin"
+)
+
+
+def _fill_missing(listed: Business, details: Optional[Business]) -> Business:
+    """Uzupełnia puste pola firmy z karty na liście danymi z jej profilu."""
+    if details:
+        for name in _CONTACT_FIELDS:
+            if not getattr(listed, name):
+                setattr(listed, name, getattr(details, name))
+        listed.has_website = bool(listed.website)
+        listed.profile_url = listed.profile_url or details.profile_url
+    return listed
 
 
 class PanoramaFirmScraper:
     """Scraper dla Panorama Firm."""
 
-    def __init__(self):
+    # robots.txt per host, wspólny dla wszystkich instancji
+    _robots_cache: Dict[str, RobotFileParser] = {}
+
+    def __init__(self, seen_path: Optional[Path] = None):
+        """
+        Inicjalizuje scraper.
+
+        Args:
+            seen_path: Plik z kluczami już widzianych firm (deduplikacja
+                między uruchomieniami); None = tylko w obrębie sesji
+        """
         self.base_url = BASE_URL
         self.session_cookies = {}
+        self.session = create_session(pool_size=max(10, MAX_CONCURRENT_REQUESTS))
+        self.seen_path = seen_path
+        self._seen = load_seen_keys(seen_path)
 
     def search_businesses(
         self,
         industry: str,
         city: str = CITY,
-        max_results: int = 50
+        max_results: int = 50,
+        only_missing_website: bool = False,
+        fetch_details: bool = True
     ) -> Generator[Business, None, None]:
         """
         Wyszukuje firmy w Panorama Firm.
 
+        Profil firmy jest pobierany tylko wtedy, gdy karta na liście wyników
+        nie zawiera telefonu, adresu i strony www.
+
         Args:
             industry: Branża do wyszukania
             city: Miasto
             max_results: Maksymalna liczba wyników
+            only_missing_website: Nie pobieraj profilu firm, które już na
+                liście wyników mają stronę www (zwracane są bez szczegółów)
+            fetch_details: False = nigdy nie pobieraj profili, zwracaj
+                tylko dane z listy wyników
 
         Yields:
             Business objects
@@ -75,77 +163,157 @@ class PanoramaFirmScraper:
 
         # Użyj URL kategorii zamiast wyszukiwarki (lepsza struktura)
         # Format: https://panoramafirm.pl/restauracje/szczecin
-        category_url = f"{self.base_url}/{quote(industry)}/{city.lower()}"
+        category_url = f"{self.base_url}/{quote(industry)}/{slugify(city)}"
 
         results_count = 0
         page = 1
+        prev_first = None
+        # Następna strona listy pobierana w tle, gdy przetwarzamy bieżącą
+        next_page = None
+
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            while results_count < max_results:
+                url = category_url if page == 1 else f"{category_url},{page}"
+                logger.info(f"Fetching page {page}: {url}")
+
+                if next_page is not None:
+                    body = next_page.result()
+                    next_page = None
+                else:
+                    body = self._fetch_listing_page(url)
+                if body is None:
+                    break
 
-        while results_count < max_results:
-            url = category_url if page == 1 else f"{category_url},{page}"
-            logger.info(f"Fetching page {page}: {url}")
-
-            response = make_request(url)
-            if not response:
-                logger.warning(f"Failed to fetch page {page}")
-                break
-
-            soup = BeautifulSoup(response.text, "lxml")
-            html = response.text
+                tree = parse(body)
 
-            # Nowa struktura - szukaj linków do firm
-            # Klasa: addax-cs_hl_hit_company_name_click
-            results = soup.select("a.addax-cs_hl_hit_company_name_click")
+                # Nowa struktura - szukaj linków do firm
+                # Klasa: addax-cs_hl_hit_company_name_click
+                results = tree.css(_SEL_RESULT_LINKS[0])
 
-            if not results:
-                # Alternatywnie - szukaj wszystkich linków do /firma/
-                results = soup.select("a[href*='/firma/']")
+                if not results:
+                    # Alternatywnie - szukaj wszystkich linków do /firma/
+                    results = tree.css(_SEL_RESULT_LINKS[1])
 
-            if not results:
-                # Ostatnia próba - szukaj w article/div
-                results = soup.select("article a[href*='panoramafirm.pl'], div.company a")
+                if not results:
+                    # Ostatnia próba - szukaj w article/div
+                    results = tree.css(_SEL_RESULT_LINKS[2])
 
-            if not results:
-                logger.info(f"No results on page {page}")
-                break
-
-            for link in results:
-                if results_count >= max_results:
+                if not results:
+                    logger.info(f"No results on page {page}")
                     break
 
-                try:
-                    href = link.get("href", "")
-                    name = clean_text(link.get_text())
+                # Serwis zwraca ostatnią stronę zamiast nieistniejącej
+                first = attr(results[0], "href")
+                if first == prev_first:
+                    logger.info(f"Page {page} repeats the previous one")
+                    break
+                prev_first = first
 
-                    if not name or not href:
+                # Sprawdź paginację - niepełna strona to ostatnia; bez linku
+                # do następnej próbujemy maksymalnie 5 stron
+                next_link = (
+                    tree.css_first(_SEL_NEXT)
+                    or tree.css_first(_SEL_NEXT_TEXT)
+                )
+                has_next = len(results) >= PAGE_SIZE and (next_link or page < 5)
+
+                # Pobierz następną stronę w tle, jeśli ta nie wystarczy do limitu
+                if has_next and results_count + len(results) < max_results:
+                    next_page = prefetcher.submit(
+                        self._fetch_listing_page, f"{category_url},{page + 1}"
+                    )
+
+                # Wiersze strony w kolejności listy; None = czeka na profil
+                rows = []
+                # Profile do pobrania z tej strony: (indeks wiersza, url, nazwa, karta)
+                pending = []
+
+                for link in results:
+                    if results_count + len(rows) >= max_results:
+                        break
+
+                    try:
+                        href = attr(link, "href")
+                        name = clean_text(link.text())
+
+                        if not name or not href:
+                            continue
+
+                        # Pełny URL
+                        href = abs_url(self.base_url, href)
+
+                        # Najpierw dane z karty na liście - profil tylko gdy czegoś brakuje
+                        card = self._find_listing_card(link)
+                        listed = self._parse_search_result(card, industry) if card else None
+
+                        # Deduplikacja między zapytaniami - pomiń przed pobraniem profilu.
+                        # Klucz nazwa + telefon z karty, jak w get_businesses_by_category()
+                        if listed:
+                            key = make_dedup_key(listed.name, listed.phone)
+                        else:
+                            key = make_dedup_key(name, "")
+                        if key in self._seen:
+                            continue
+                        self._seen.add(key)
+
+                        if not fetch_details or (listed and (
+                            (listed.phone and listed.address and listed.website)
+                            or (only_missing_website and listed.has_website)
+                        )):
+                            rows.append(listed or Business(
+                                name=name, industry=industry, source="panorama_firm",
+                                profile_url=href
+                            ))
+                            continue
+
+                        if not robots_allows(href, self._robots_cache, self.session):
+                            logger.debug(f"Blocked by robots.txt: {href}")
+                            continue
+
+                        pending.append((len(rows), href, name, listed))
+                        rows.append(None)
+
+                    except Exception as e:
+                        logger.debug(f"Error processing link: {e}")
                         continue
 
-                    # Pełny URL
-                    if not href.startswith("http"):
-                        href = urljoin(self.base_url, href)
+                # Pobierz szczegóły ze stron firm równolegle - tempo żądań
+                # i tak ogranicza wspólny _limiter
+                if pending:
+                    indices, urls, names, cards = zip(*pending)
+                    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+                        details = list(pool.map(
+                            self._fetch_company_details, urls, names, repeat(industry)
+                        ))
+
+                    # Profil uzupełnia tylko pola, których brakowało na karcie
+                    for i, listed, business in zip(indices, cards, details):
+                        rows[i] = _fill_missing(listed, business) if listed else business
 
-                    # Pobierz szczegóły ze strony firmy
-                    business = self._fetch_company_details(href, name, industry)
+                for business in rows:
                     if business:
                         yield business
                         results_count += 1
-                        logger.debug(f"  + {name}")
-                        random_delay(2, 4)
+                        logger.debug(f"  + {business.name}")
 
-                except Exception as e:
-                    logger.debug(f"Error processing link: {e}")
-                    continue
+                if not has_next:
+                    break
 
-            # Sprawdź paginację - szukaj linku do następnej strony
-            next_link = soup.select_one("a[rel='next'], a:contains('Następna'), a:contains('›')")
-            if not next_link and page < 5:  # Max 5 stron
-                # Spróbuj następnej strony
-                page += 1
-                random_delay(3, 5)
-            elif next_link:
                 page += 1
-                random_delay(3, 5)
-            else:
-                break
+
+    def _fetch_listing_page(self, url: str) -> Optional[Union[str, bytes]]:
+        """Pobiera stronę listy wyników; None gdy zablokowana lub niedostępna."""
+        if not robots_allows(url, self._robots_cache, self.session):
+            logger.warning(f"Blocked by robots.txt: {url}")
+            return None
+
+        _limiter.acquire()
+        response = make_request(url, stream=True, session=self.session)
+        if not response:
+            logger.warning(f"Failed to fetch page: {url}")
+            return None
+
+        return page_html(read_body(response), response.charset_encoding)
 
     def _fetch_company_details(
         self,
@@ -155,60 +323,84 @@ class PanoramaFirmScraper:
     ) -> Optional[Business]:
         """Pobiera szczegóły firmy z jej strony profilu."""
         try:
-            response = make_request(url)
+            _limiter.acquire()
+            response = make_request(url, session=self.session)
             if not response:
-                return Business(name=name, industry=industry, source="panorama_firm")
+                return Business(
+                    name=name, industry=industry, source="panorama_firm",
+                    profile_url=url
+                )
 
-            soup = BeautifulSoup(response.text, "lxml")
-            html = response.text
+            # Surowe bajty - bez zgadywania kodowania; inne niż UTF-8 dekodowane
+            content = page_html(response.content, response.charset_encoding)
+            tree = parse(content)
+            contact = contact_html(tree, content)
+
+            # Jeden przebieg po drzewie - pierwszy pasujący element dla każdego pola
+            addr_elem = phone_elem = email_elem = www_elem = None
+            for node in tree.css(_PROFILE_CONTACT_SELECTOR):
+                tag = node.tag
+                href = attr(node, "href")
+                itemprop = attr(node, "itemprop")
+                classes = attr(node, "class").split()
+
+                if addr_elem is None and (
+                    itemprop == "address" or tag == "address" or "address" in classes
+                ):
+                    addr_elem = node
+                if phone_elem is None and (
+                    (tag == "a" and href.startswith("tel:")) or itemprop == "telephone"
+                ):
+                    phone_elem = node
+                if email_elem is None and tag == "a" and href.startswith("mailto:"):
+                    email_elem = node
+                if www_elem is None and tag == "a" and (
+                    attr(node, "data-stat-id") == "www"
+                    or "website" in classes
+                    or (attr(node, "rel") == "nofollow" and href.startswith("http"))
+                ):
+                    www_elem = node
+
+                if addr_elem and phone_elem and email_elem and www_elem:
+                    break
 
             # Adres
             address = ""
-            addr_elem = soup.select_one(
-                "[itemprop='address'], .address, address"
-            )
             if addr_elem:
-                address = clean_text(addr_elem.get_text())
+                address = clean_text(addr_elem.text())
 
             # Telefon
             phone = ""
-            phone_elem = soup.select_one(
-                "a[href^='tel:'], [itemprop='telephone']"
-            )
             if phone_elem:
-                phone = phone_elem.get("href", "").replace("tel:", "")
+                phone = attr(phone_elem, "href").replace("tel:", "")
                 if not phone:
-                    phone = clean_text(phone_elem.get_text())
+                    phone = clean_text(phone_elem.text())
 
             # Alternatywnie - wyciągnij z tekstu
             if not phone:
-                phones = extract_phones(html)
+                phones = extract_phones(contact)
                 if phones:
                     phone = phones[0]
 
             # Email
             email = ""
-            email_elem = soup.select_one("a[href^='mailto:']")
             if email_elem:
-                email = email_elem.get("href", "").replace("mailto:", "")
+                email = attr(email_elem, "href").replace("mailto:", "")
 
             if not email:
-                emails = extract_emails(html)
+                emails = extract_emails(contact)
                 if emails:
                     email = emails[0]
 
             # Strona www
             website = ""
-            www_elem = soup.select_one(
-                "a[data-stat-id='www'], a.website, a[rel='nofollow'][href^='http']"
-            )
             if www_elem:
-                href = www_elem.get("href", "")
+                href = attr(www_elem, "href")
                 if is_valid_website(href):
                     website = href
 
             # Social media
-            social = extract_social_media(html)
+            social = extract_social_media_from_tree(tree)
 
             return Business(
                 name=name,
@@ -221,65 +413,74 @@ class PanoramaFirmScraper:
                 instagram=social.get("instagram", ""),
                 linkedin=social.get("linkedin", ""),
                 source="panorama_firm",
-                has_website=bool(website)
+                has_website=bool(website),
+                profile_url=url
             )
 
         except Exception as e:
             logger.debug(f"Error fetching details for {name}: {e}")
-            return Business(name=name, industry=industry, source="panorama_firm")
+            return Business(
+                name=name, industry=industry, source="panorama_firm",
+                profile_url=url
+            )
+
+    def _find_listing_card(self, link):
+        """Zwraca element karty wyniku zawierający link do profilu firmy."""
+        node = link.parent
+        while node is not None:
+            if (
+                node.tag == "article"
+                or "company-item" in attr(node, "class").split()
+                or "LocalBusiness" in attr(node, "itemtype")
+            ):
+                return node
+            node = node.parent
+        return None
 
     def _parse_search_result(self, element, industry: str) -> Optional[Business]:
         """Parsuje pojedynczy wynik wyszukiwania."""
         try:
             # Nazwa firmy
-            name_elem = element.select_one(
-                "h2 a, h3 a, .company-name a, .name a, a[title]"
-            )
+            name_elem = first_match(element, _SEL_CARD_NAME)
             if not name_elem:
                 return None
 
-            name = clean_text(name_elem.get_text())
+            name = clean_text(name_elem.text())
             if not name:
                 return None
 
             # Link do strony firmy w katalogu
-            detail_url = name_elem.get("href", "")
-            if detail_url and not detail_url.startswith("http"):
-                detail_url = urljoin(self.base_url, detail_url)
+            detail_url = attr(name_elem, "href")
+            if detail_url:
+                detail_url = abs_url(self.base_url, detail_url)
 
             # Adres
             address = ""
-            addr_elem = element.select_one(
-                ".address, .company-address, span[itemprop='address'], .location"
-            )
+            addr_elem = first_match(element, _SEL_CARD_ADDR)
             if addr_elem:
-                address = clean_text(addr_elem.get_text())
+                address = clean_text(addr_elem.text())
 
             # Telefon
             phone = ""
-            phone_elem = element.select_one(
-                ".phone, .tel, a[href^='tel:'], span[itemprop='telephone']"
-            )
+            phone_elem = first_match(element, _SEL_CARD_PHONE)
             if phone_elem:
-                phone = clean_text(phone_elem.get_text())
+                phone = clean_text(phone_elem.text())
                 if not phone:
-                    phone = phone_elem.get("href", "").replace("tel:", "")
+                    phone = attr(phone_elem, "href").replace("tel:", "")
 
             # Strona www
             website = ""
-            www_elem = element.select_one(
-                "a.website, a.www, a[href*='http']:not([href*='panoramafirm'])"
-            )
+            www_elem = first_match(element, _SEL_CARD_WWW)
             if www_elem:
-                href = www_elem.get("href", "")
+                href = attr(www_elem, "href")
                 if is_valid_website(href):
                     website = href
 
             # Email
             email = ""
-            email_elem = element.select_one("a[href^='mailto:']")
+            email_elem = element.css_first(_SEL_EMAIL)
             if email_elem:
-                email = email_elem.get("href", "").replace("mailto:", "")
+                email = attr(email_elem, "href").replace("mailto:", "")
 
             return Business(
                 name=name,
@@ -289,7 +490,8 @@ class PanoramaFirmScraper:
                 email=email,
                 website=website,
                 source="panorama_firm",
-                has_website=bool(website)
+                has_website=bool(website),
+                profile_url=detail_url
             )
 
         except Exception as e:
@@ -301,49 +503,56 @@ class PanoramaFirmScraper:
         Pobiera szczegółowe dane firmy ze strony profilu.
 
         Args:
-            business: Obiekt Business z podstawowymi danymi
+            business: Obiekt Business z podstawowymi danymi i profile_url
+                zapisanym z listy wyników (bez niego nic nie jest pobierane)
 
         Returns:
             Business z uzupełnionymi danymi
         """
+        # Adresów profili nie da się odgadnąć z nazwy firmy
+        if not business.profile_url:
+            return business
+
         try:
-            # Szukaj strony profilu
-            search_url = f"{self.base_url}/{quote(business.name.lower().replace(' ', '-'))}"
+            if not robots_allows(business.profile_url, self._robots_cache, self.session):
+                logger.debug(f"Blocked by robots.txt: {business.profile_url}")
+                return business
 
-            response = make_request(search_url)
+            _limiter.acquire()
+            response = make_request(business.profile_url, session=self.session)
             if not response:
                 return business
 
-            soup = BeautifulSoup(response.text, "lxml")
-            html = response.text
+            # Surowe bajty - bez zgadywania kodowania; inne niż UTF-8 dekodowane
+            content = page_html(response.content, response.charset_encoding)
+            tree = parse(content)
+            contact = contact_html(tree, content)
 
             # Uzupełnij brakujące dane
 
             # Email
             if not business.email:
-                emails = extract_emails(html)
+                emails = extract_emails(contact)
                 if emails:
                     business.email = emails[0]
 
             # Telefon
             if not business.phone:
-                phones = extract_phones(html)
+                phones = extract_phones(contact)
                 if phones:
                     business.phone = phones[0]
 
             # Strona www
             if not business.website:
-                www_elem = soup.select_one(
-                    "a[data-stat-id='www'], a.company-www, a[rel='nofollow'][href^='http']"
-                )
+                www_elem = first_match(tree, _SEL_DETAILS_WWW)
                 if www_elem:
-                    href = www_elem.get("href", "")
+                    href = attr(www_elem, "href")
                     if is_valid_website(href):
                         business.website = href
                         business.has_website = True
 
             # Social media
-            social = extract_social_media(html)
+            social = extract_social_media_from_tree(tree)
             if not business.facebook and social.get("facebook"):
                 business.facebook = social["facebook"]
             if not business.instagram and social.get("instagram"):
@@ -353,11 +562,9 @@ class PanoramaFirmScraper:
 
             # Adres (jeśli brakuje)
             if not business.address:
-                addr_elem = soup.select_one(
-                    "address, .address, span[itemprop='streetAddress']"
-                )
+                addr_elem = first_match(tree, _SEL_DETAILS_ADDR)
                 if addr_elem:
-                    business.address = clean_text(addr_elem.get_text())
+                    business.address = clean_text(addr_elem.text())
 
             return business
 
@@ -383,39 +590,82 @@ class PanoramaFirmScraper:
             Business objects
         """
         # URL kategorii: https://panoramafirm.pl/restauracje/szczecin
-        category_url = f"{self.base_url}/{category_slug}/{city.lower()}"
+        category_url = f"{self.base_url}/{category_slug}/{slugify(city)}"
 
         logger.info(f"Fetching category: {category_url}")
 
         results_count = 0
         page = 1
+        prev_first = None
 
         while results_count < max_results:
             url = f"{category_url}" if page == 1 else f"{category_url},{page}"
 
-            response = make_request(url)
-            if not response:
+            body = self._fetch_listing_page(url)
+            if body is None:
                 break
 
-            soup = BeautifulSoup(response.text, "lxml")
+            tree = parse(body)
 
             # Znajdź firmy
-            companies = soup.select(
-                "div.company-item, article.item, div[itemtype*='LocalBusiness']"
-            )
+            companies = tree.css(_SEL_COMPANIES)
 
             if not companies:
                 break
 
+            first = companies[0].html
+            if first == prev_first:
+                break
+            prev_first = first
+
             for company in companies:
                 if results_count >= max_results:
                     break
 
                 business = self._parse_search_result(company, category_slug)
                 if business:
+                    key = make_dedup_key(business.name, business.phone)
+                    if key in self._seen:
+                        continue
+                    self._seen.add(key)
+
                     yield business
                     results_count += 1
-                    random_delay(1, 2)
+
+            if len(companies) < PAGE_SIZE:
+                break
 
             page += 1
-            random_delay(3, 5)
+
+    def crawl_to_csv(
+        self,
+        industry: str,
+        out_path: Union[str, Path],
+        chunk: int = 64,
+        city: str = CITY,
+        max_results: int = 50
+    ) -> int:
+        """
+        Wyszukuje firmy i zapisuje je do pliku CSV partiami po `chunk` wierszy.
+
+        Args:
+            industry: Branża do wyszukania
+            out_path: Ścieżka pliku CSV
+            chunk: Liczba wierszy zapisywanych naraz
+            city: Miasto
+            max_results: Maksymalna liczba wyników
+
+        Returns:
+            Liczba zapisanych firm
+        """
+        return crawl_to_csv(
+            self.search_businesses(industry, city, max_results),
+            out_path,
+            fieldnames=_PUBLIC_FIELDS,
+            chunk=chunk
+        )
+
+    def close(self):
+        """Zapisuje klucze deduplikacji (jeśli ustawiono seen_path)."""
+        save_seen_keys(self._seen, self.seen_path)
+        self.session.close()
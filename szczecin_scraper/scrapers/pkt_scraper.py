@@ -6,18 +6,23 @@ które nie są obecne w innych katalogach online.
 """
 import logging
 import re
-from typing import Generator, Optional
-from urllib.parse import urljoin, quote
-from dataclasses import dataclass, asdict
-
-from bs4 import BeautifulSoup
-
-import sys
-sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
-from config import CITY
-from utils.helpers import make_request, random_delay, clean_text
-from utils.validators import (
-    extract_emails, extract_phones, extract_social_media,
+from pathlib import Path
+from typing import Dict, Generator, Optional, Union
+from urllib.parse import quote
+from urllib.robotparser import RobotFileParser
+from dataclasses import dataclass
+
+from szczecin_scraper.config import CITY
+from szczecin_scraper.utils.helpers import (
+    make_request, clean_text, slugify, TokenBucket,
+    create_session, robots_allows,
+    make_dedup_key, load_seen_keys, save_seen_keys, crawl_to_csv
+)
+from szczecin_scraper.utils.html import (
+    parse, page_html, attr, contact_html, first_match
+)
+from szczecin_scraper.utils.validators import (
+    extract_emails, extract_phones, extract_social_media_from_tree,
     is_valid_website
 )
 
@@ -25,8 +30,40 @@ logger = logging.getLogger(__name__)
 
 BASE_URL = "https://www.pkt.pl"
 
+# Liczba firm na pełnej stronie wyników - mniej oznacza ostatnią stronę
+PAGE_SIZE = 20
+
+_TEL_PREFIX_RE = re.compile(r'^(tel\.?:?\s*)', re.IGNORECASE)
+_WWW_RE = re.compile(r'www\.[a-z0-9.-]+\.[a-z]{2,}', re.IGNORECASE)
+
+# Selektory CSS - zdefiniowane raz dla całego modułu. Krotki to warianty
+# w kolejności priorytetu (sprawdzane po kolei, patrz first_match)
+_SEL_RESULTS = (
+    "div.search-result-item, article.company, div.result-item, "
+    "li.search-result, div[data-id]"
+)
+_SEL_RESULTS_ALT = "div.company-box, div.firm-item"
+_SEL_NEXT = ("a.next", "a[rel='next']", "li.pagination-next a", "a.pagination__next")
+_SEL_NAME = (
+    "h2 a", "h3 a", ".company-name", ".firm-name", "a.title", ".name a",
+    "a[href*='/firma/']",
+)
+_SEL_ADDR = (".address", ".location", ".firma-address", "span.street")
+_SEL_CITY = (".city", ".miasto")
+_SEL_PHONE = (".phone", ".tel", ".telefon", "a[href^='tel:']")
+_SEL_EMAIL = "a[href^='mailto:']"
+_SEL_WWW = ("a.www", "a.website", "a[target='_blank'][href^='http']")
+_SEL_PROFILE_NAME = ("h1", ".company-name", ".firma-name")
+_SEL_PROFILE_ADDR = ("address", ".address", "[itemprop='address']")
+_SEL_PROFILE_WWW = (
+    "a[data-type='www']", "a.website-link", "a[rel='nofollow'][href^='http']"
+)
+
+# Wspólny limit żądań do pkt.pl dla wszystkich instancji scrapera
+_limiter = TokenBucket()
+
 
-@dataclass
+@dataclass(slots=True)
 class Business:
     """Reprezentacja firmy."""
     name: str
@@ -44,14 +81,28 @@ class Business:
     has_website: bool = True
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Płaskie pola - bez głębokiej kopii, którą robi asdict()
+        return {f: getattr(self, f) for f in self.__slots__}
 
 
 class PKTScraper:
     """Scraper dla PKT.pl."""
 
-    def __init__(self):
+    # robots.txt per host, wspólny dla wszystkich instancji
+    _robots_cache: Dict[str, RobotFileParser] = {}
+
+    def __init__(self, seen_path: Optional[Path] = None):
+        """
+        Inicjalizuje scraper.
+
+        Args:
+            seen_path: Plik z kluczami już widzianych firm (deduplikacja
+                między uruchomieniami); None = tylko w obrębie sesji
+        """
         self.base_url = BASE_URL
+        self.session = create_session()
+        self.seen_path = seen_path
+        self._seen = load_seen_keys(seen_path)
 
     def search_businesses(
         self,
@@ -74,36 +125,46 @@ class PKTScraper:
 
         # Buduj URL wyszukiwania
         # Format: https://www.pkt.pl/szukaj/restauracje/szczecin
-        search_url = f"{self.base_url}/szukaj/{quote(industry)}/{city.lower()}"
+        search_url = f"{self.base_url}/szukaj/{quote(industry)}/{slugify(city)}"
 
         results_count = 0
         page = 1
+        prev_first = None
 
         while results_count < max_results:
             url = search_url if page == 1 else f"{search_url}/strona/{page}"
             logger.info(f"Fetching: {url}")
 
-            response = make_request(url)
+            if not robots_allows(url, self._robots_cache, self.session):
+                logger.warning(f"Blocked by robots.txt: {url}")
+                break
+
+            _limiter.acquire()
+            response = make_request(url, session=self.session)
             if not response:
                 logger.warning(f"Failed to fetch page {page}")
                 break
 
-            soup = BeautifulSoup(response.text, "lxml")
+            tree = parse(page_html(response.content, response.charset_encoding))
 
             # Znajdź wyniki
-            results = soup.select(
-                "div.search-result-item, article.company, div.result-item, "
-                "li.search-result, div[data-id]"
-            )
+            results = tree.css(_SEL_RESULTS)
 
             if not results:
                 # Alternatywne selektory
-                results = soup.select("div.company-box, div.firm-item")
+                results = tree.css(_SEL_RESULTS_ALT)
 
             if not results:
                 logger.info(f"No results found on page {page}")
                 break
 
+            # Serwis zwraca ostatnią stronę zamiast nieistniejącej
+            first = results[0].html
+            if first == prev_first:
+                logger.info(f"Page {page} repeats the previous one")
+                break
+            prev_first = first
+
             for result in results:
                 if results_count >= max_results:
                     break
@@ -111,89 +172,83 @@ class PKTScraper:
                 try:
                     business = self._parse_result(result, industry)
                     if business:
+                        key = make_dedup_key(business.name, business.phone)
+                        if key in self._seen:
+                            continue
+                        self._seen.add(key)
+
                         yield business
                         results_count += 1
-                        random_delay(1, 2)
 
                 except Exception as e:
                     logger.debug(f"Error parsing result: {e}")
                     continue
 
+            # Niepełna strona - to była ostatnia
+            if len(results) < PAGE_SIZE:
+                break
+
             # Sprawdź czy jest następna strona
-            next_link = soup.select_one(
-                "a.next, a[rel='next'], li.pagination-next a, a.pagination__next"
-            )
+            next_link = first_match(tree, _SEL_NEXT)
             if not next_link:
                 break
 
             page += 1
-            random_delay(3, 5)
 
     def _parse_result(self, element, industry: str) -> Optional[Business]:
         """Parsuje pojedynczy wynik wyszukiwania."""
         try:
             # Nazwa firmy
-            name_elem = element.select_one(
-                "h2 a, h3 a, .company-name, .firm-name, a.title, .name a"
-            )
-            if not name_elem:
-                name_elem = element.select_one("a[href*='/firma/']")
-
+            name_elem = first_match(element, _SEL_NAME)
             if not name_elem:
                 return None
 
-            name = clean_text(name_elem.get_text())
+            name = clean_text(name_elem.text())
             if not name:
                 return None
 
             # Adres
             address = ""
-            addr_elem = element.select_one(
-                ".address, .location, .firma-address, span.street"
-            )
+            addr_elem = first_match(element, _SEL_ADDR)
             if addr_elem:
-                address = clean_text(addr_elem.get_text())
+                address = clean_text(addr_elem.text())
 
             # Sprawdź czy adres zawiera miasto (Szczecin)
-            city_elem = element.select_one(".city, .miasto")
+            city_elem = first_match(element, _SEL_CITY)
             if city_elem:
-                city_text = clean_text(city_elem.get_text())
+                city_text = clean_text(city_elem.text())
                 if city_text and city_text not in address:
                     address = f"{address}, {city_text}" if address else city_text
 
             # Telefon
             phone = ""
-            phone_elem = element.select_one(
-                ".phone, .tel, .telefon, a[href^='tel:']"
-            )
+            phone_elem = first_match(element, _SEL_PHONE)
             if phone_elem:
-                phone = clean_text(phone_elem.get_text())
+                phone = clean_text(phone_elem.text())
                 if not phone:
-                    phone = phone_elem.get("href", "").replace("tel:", "")
+                    phone = attr(phone_elem, "href").replace("tel:", "")
 
             # Usuń tekst "tel:" itp.
-            phone = re.sub(r'^(tel\.?:?\s*)', '', phone, flags=re.IGNORECASE)
+            phone = _TEL_PREFIX_RE.sub('', phone)
 
             # Email
             email = ""
-            email_elem = element.select_one("a[href^='mailto:']")
+            email_elem = element.css_first(_SEL_EMAIL)
             if email_elem:
-                email = email_elem.get("href", "").replace("mailto:", "")
+                email = attr(email_elem, "href").replace("mailto:", "")
 
             # Strona www
             website = ""
-            www_elem = element.select_one(
-                "a.www, a.website, a[target='_blank'][href^='http']"
-            )
+            www_elem = first_match(element, _SEL_WWW)
             if www_elem:
-                href = www_elem.get("href", "")
+                href = attr(www_elem, "href")
                 if is_valid_website(href):
                     website = href
 
             # Sprawdź też tekst elementu
             if not website:
-                text = element.get_text()
-                www_match = re.search(r'www\.[a-z0-9.-]+\.[a-z]{2,}', text, re.IGNORECASE)
+                text = element.text()
+                www_match = _WWW_RE.search(text)
                 if www_match:
                     potential_website = f"https://{www_match.group(0)}"
                     if is_valid_website(potential_website):
@@ -226,48 +281,51 @@ class PKTScraper:
             Business object z pełnymi danymi
         """
         try:
-            response = make_request(profile_url)
+            if not robots_allows(profile_url, self._robots_cache, self.session):
+                logger.warning(f"Blocked by robots.txt: {profile_url}")
+                return None
+
+            _limiter.acquire()
+            response = make_request(profile_url, session=self.session)
             if not response:
                 return None
 
-            soup = BeautifulSoup(response.text, "lxml")
-            html = response.text
+            # Surowe bajty - bez zgadywania kodowania; inne niż UTF-8 dekodowane
+            content = page_html(response.content, response.charset_encoding)
+            tree = parse(content)
+            contact = contact_html(tree, content)
 
             # Nazwa
-            name_elem = soup.select_one("h1, .company-name, .firma-name")
-            name = clean_text(name_elem.get_text()) if name_elem else ""
+            name_elem = first_match(tree, _SEL_PROFILE_NAME)
+            name = clean_text(name_elem.text()) if name_elem else ""
 
             if not name:
                 return None
 
             # Adres
             address = ""
-            addr_elem = soup.select_one(
-                "address, .address, [itemprop='address']"
-            )
+            addr_elem = first_match(tree, _SEL_PROFILE_ADDR)
             if addr_elem:
-                address = clean_text(addr_elem.get_text())
+                address = clean_text(addr_elem.text())
 
             # Telefon
-            phones = extract_phones(html)
+            phones = extract_phones(contact)
             phone = phones[0] if phones else ""
 
             # Email
-            emails = extract_emails(html)
+            emails = extract_emails(contact)
             email = emails[0] if emails else ""
 
             # Strona www
             website = ""
-            www_elem = soup.select_one(
-                "a[data-type='www'], a.website-link, a[rel='nofollow'][href^='http']"
-            )
+            www_elem = first_match(tree, _SEL_PROFILE_WWW)
             if www_elem:
-                href = www_elem.get("href", "")
+                href = attr(www_elem, "href")
                 if is_valid_website(href):
                     website = href
 
             # Social media
-            social = extract_social_media(html)
+            social = extract_social_media_from_tree(tree)
 
             return Business(
                 name=name,
@@ -286,3 +344,36 @@ class PKTScraper:
         except Exception as e:
             logger.error(f"Error getting details from {profile_url}: {e}")
             return None
+
+    def crawl_to_csv(
+        self,
+        industry: str,
+        out_path: Union[str, Path],
+        chunk: int = 64,
+        city: str = CITY,
+        max_results: int = 50
+    ) -> int:
+        """
+        Wyszukuje firmy i zapisuje je do pliku CSV partiami po `chunk` wierszy.
+
+        Args:
+            industry: Branża do wyszukania
+            out_path: Ścieżka pliku CSV
+            chunk: Liczba wierszy zapisywanych naraz
+            city: Miasto
+            max_results: Maksymalna liczba wyników
+
+        Returns:
+            Liczba zapisanych firm
+        """
+        return crawl_to_csv(
+            self.search_businesses(industry, city, max_results),
+            out_path,
+            fieldnames=Business.__slots__,
+            chunk=chunk
+        )
+
+    def close(self):
+        """Zapisuje klucze deduplikacji (jeśli ustawiono seen_path)."""
+        save_seen_keys(self._seen, self.seen_path)
+        self.session.close()
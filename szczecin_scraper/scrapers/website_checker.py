@@ -4,23 +4,141 @@ Moduł do weryfikacji stron internetowych firm.
 Sprawdza czy podany URL faktycznie prowadzi do działającej strony
 i czy jest to prawdziwa strona firmowa (a nie social media czy katalog).
 """
+import asyncio
 import logging
 import re
-from typing import Optional, Dict, Tuple
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Optional, Dict, List, Set, Tuple
 from urllib.parse import urlparse
 from dataclasses import dataclass
 import socket
 
-import requests
+import httpx
 
-import sys
-sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
-from utils.helpers import make_request, get_headers
-from utils.validators import (
+try:
+    import h2  # noqa: F401 - wymagane przez httpx do HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+from szczecin_scraper.utils.helpers import get_headers, AsyncTokenBucket
+from szczecin_scraper.utils.validators import (
     is_valid_website, extract_emails, extract_phones, extract_social_media
 )
 
 logger = logging.getLogger(__name__)
+# httpx loguje każde żądanie na poziomie INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Hosty, których nazwa niedawno się nie rozwiązała: host -> czas wygaśnięcia.
+# DNS sprawdza sam klient HTTP - tu pamiętamy tylko porażki
+DNS_NEGATIVE_TTL = 30
+_dns_failures: Dict[str, float] = {}
+
+# Do oceny strony wystarczy jej początek - reszty nie pobieramy
+MAX_PAGE_BYTES = 64 * 1024
+
+# Znaczniki parkingu/placeholdera są na początku strony (rzadko w stopce) -
+# wzorce sprawdzamy tylko w tych fragmentach
+SCAN_HEAD_CHARS = 32 * 1024
+SCAN_TAIL_CHARS = 4 * 1024
+
+# Statusy, którymi serwery odpowiadają na samo HEAD, choć GET działa
+_HEAD_UNRELIABLE = {400, 403, 405, 501}
+
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+
+
+class _PatternSet:
+    """
+    Zestaw wzorców (bez rozróżniania wielkości liter) sprawdzany jednym
+    przejściem po stronie.
+
+    Kolejność silników, zależnie od zainstalowanych pakietów:
+    - hyperscan: wszystkie wzorce w jednej skompilowanej bazie (DFA),
+    - pyahocorasick: wzorce bez metaznaków w automacie Aho-Corasick,
+      reszta w jednym wyrażeniu regularnym,
+    - samo re: jedno wyrażenie ze wszystkimi wzorcami (full_re).
+    """
+
+    def __init__(self, patterns: List[str], full_re: re.Pattern):
+        self.full_re = full_re
+        self.database = None
+        # Scratch hyperscan nie może być używany przez dwa wątki naraz
+        self._local = threading.local()
+        self.automaton = None
+        self.rest_re = None
+
+        if HYPERSCAN_AVAILABLE:
+            flags = (
+                hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8
+                | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+            )
+            self.database = hyperscan.Database()
+            self.database.compile(
+                expressions=[p.encode("utf-8") for p in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[flags] * len(patterns),
+            )
+            return
+
+        literals = [p for p in patterns if not _REGEX_META.intersection(p)]
+        if not AHOCORASICK_AVAILABLE or not literals:
+            return
+
+        self.automaton = ahocorasick.Automaton()
+        for literal in literals:
+            self.automaton.add_word(literal.lower(), literal)
+        self.automaton.make_automaton()
+
+        rest = [p for p in patterns if p not in literals]
+        if rest:
+            self.rest_re = re.compile(
+                "|".join(f"(?:{p})" for p in rest), re.IGNORECASE
+            )
+
+    def search(self, html: str) -> bool:
+        """Sprawdza czy którykolwiek wzorzec występuje w tekście."""
+        if self.database is not None:
+            try:
+                scratch = getattr(self._local, "scratch", None)
+                if scratch is None:
+                    scratch = self._local.scratch = hyperscan.Scratch(self.database)
+                # Callback zwracający True przerywa skanowanie przy 1. trafieniu
+                self.database.scan(
+                    html.encode("utf-8", errors="ignore"),
+                    match_event_handler=lambda *args: True,
+                    scratch=scratch
+                )
+            except hyperscan.ScanTerminated:
+                return True
+            except hyperscan.error as e:
+                logger.debug(f"Hyperscan error, falling back to re: {e}")
+                return self.full_re.search(html) is not None
+            return False
+
+        if self.automaton is None:
+            return self.full_re.search(html) is not None
+        if next(self.automaton.iter(html.lower()), None) is not None:
+            return True
+        return self.rest_re is not None and self.rest_re.search(html) is not None
 
 
 @dataclass
@@ -74,6 +192,18 @@ class WebsiteChecker:
         r"nazwa\s*firmy",
     ]
 
+    # Wszystkie wzorce z listy w jednym wyrażeniu - jedno przejście po stronie
+    PARKING_RE = re.compile(
+        "|".join(f"(?:{p})" for p in PARKING_PATTERNS), re.IGNORECASE
+    )
+    PLACEHOLDER_RE = re.compile(
+        "|".join(f"(?:{p})" for p in PLACEHOLDER_PATTERNS), re.IGNORECASE
+    )
+
+    # Szybsze silniki (hyperscan / Aho-Corasick), jeśli są zainstalowane
+    _parking_set = _PatternSet(PARKING_PATTERNS, PARKING_RE)
+    _placeholder_set = _PatternSet(PLACEHOLDER_PATTERNS, PLACEHOLDER_RE)
+
     def __init__(self, timeout: int = 10):
         """
         Inicjalizuje checker.
@@ -82,6 +212,18 @@ class WebsiteChecker:
             timeout: Timeout dla requestów w sekundach
         """
         self.timeout = timeout
+        # Keep-alive (i HTTP/2, jeśli dostępne): kolejne żądania do tego
+        # samego hosta (np. /kontakt) nie powtarzają handshake'u TCP/TLS
+        self.client = httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            verify=False,  # Niektóre strony mają nieważne certyfikaty
+            headers=get_headers(),
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=100),
+        )
+        # Hosty (host:port), na których TLS nie działa - od razu przez HTTP
+        self._tls_broken: Set[str] = set()
 
     def check_website(self, url: str) -> WebsiteStatus:
         """
@@ -93,189 +235,310 @@ class WebsiteChecker:
         Returns:
             WebsiteStatus z wynikami sprawdzenia
         """
-        if not url:
-            return WebsiteStatus(
-                url="",
-                exists=False,
-                is_active=False,
-                is_company_site=False,
-                error="Empty URL"
+        url, status = self._precheck(url)
+        if status:
+            return status
+
+        try:
+            # Host z niedziałającym TLS - nie próbuj ponownie HTTPS
+            if self._tls_known_broken(url):
+                return self._check_over_http(url)
+
+            # Najpierw HEAD - błąd HTTP rozpoznamy bez pobierania treści
+            status = self._head_verdict(url, self.client.head(url))
+            if status:
+                return status
+
+            # Wykonaj request - tylko początek strony
+            with self.client.stream("GET", url) as response:
+                # Przekierowanie widać już po nagłówkach - bez pobierania treści
+                status = self._redirected_away(url, response)
+                if status:
+                    return status
+                html, complete = _read_capped(response)
+
+            return self._classify_response(
+                url, response.status_code, str(response.url), html, complete
             )
 
+        except Exception as e:
+            # None = TLS nie działa, próbuj bez SSL
+            return self._error_status(url, e) or self._check_over_http(url)
+
+    def _precheck(self, url: str) -> Tuple[str, Optional[WebsiteStatus]]:
+        """
+        Sprawdzenia przed wysłaniem żądania (wspólne dla sync i async).
+
+        Returns:
+            (znormalizowany URL, status jeśli wynik znany bez żądania)
+        """
+        if not url:
+            return "", self._failed("", "Empty URL")
+
         # Normalizuj URL
         url = self._normalize_url(url)
 
         # Sprawdź podstawową walidację
         if not is_valid_website(url):
-            return WebsiteStatus(
-                url=url,
-                exists=False,
-                is_active=False,
-                is_company_site=False,
-                error="Not a company website (social media or directory)"
+            return url, self._failed(
+                url, "Not a company website (social media or directory)"
             )
 
-        try:
-            # Sprawdź DNS
-            domain = urlparse(url).netloc
-            try:
-                socket.gethostbyname(domain)
-            except socket.gaierror:
-                return WebsiteStatus(
-                    url=url,
-                    exists=False,
-                    is_active=False,
-                    is_company_site=False,
-                    error="DNS resolution failed"
-                )
+        # Domena, która przed chwilą się nie rozwiązała
+        if _dns_failed_recently(urlparse(url).hostname or ""):
+            return url, self._failed(url, "DNS resolution failed")
 
-            # Wykonaj request
-            response = requests.get(
-                url,
-                headers=get_headers(),
-                timeout=self.timeout,
-                allow_redirects=True,
-                verify=False  # Niektóre strony mają nieważne certyfikaty
-            )
+        return url, None
 
-            status_code = response.status_code
-            final_url = response.url
-
-            # Sprawdź status code
-            if status_code >= 400:
-                return WebsiteStatus(
-                    url=url,
-                    exists=False,
-                    is_active=False,
-                    is_company_site=False,
-                    status_code=status_code,
-                    error=f"HTTP error {status_code}"
-                )
+    def _tls_known_broken(self, url: str) -> bool:
+        """Sprawdza czy TLS tego hosta już wcześniej nie zadziałał."""
+        parsed = urlparse(url)
+        return parsed.scheme == "https" and parsed.netloc in self._tls_broken
 
-            # Sprawdź czy to parking domenowy
-            is_parked = self._is_parking_page(response.text)
-            if is_parked:
-                return WebsiteStatus(
-                    url=url,
-                    exists=True,
-                    is_active=False,
-                    is_company_site=False,
-                    status_code=status_code,
-                    redirect_url=final_url if final_url != url else "",
-                    error="Domain parking page detected"
-                )
+    def _head_verdict(
+        self,
+        url: str,
+        head: httpx.Response
+    ) -> Optional[WebsiteStatus]:
+        """Status z odpowiedzi na HEAD, jeśli GET nie jest już potrzebny."""
+        if head.status_code >= 400 and head.status_code not in _HEAD_UNRELIABLE:
+            return self._classify_response(url, head.status_code, str(head.url), "")
+        return self._redirected_away(url, head)
 
-            # Sprawdź czy to placeholder
-            is_placeholder = self._is_placeholder_page(response.text)
-            if is_placeholder:
-                return WebsiteStatus(
-                    url=url,
-                    exists=True,
-                    is_active=False,
-                    is_company_site=False,
-                    status_code=status_code,
-                    error="Placeholder/template page detected"
-                )
+    def _error_status(self, url: str, error: Exception) -> Optional[WebsiteStatus]:
+        """
+        Zamienia wyjątek żądania na WebsiteStatus.
 
-            # Strona istnieje i wygląda na aktywną
-            return WebsiteStatus(
-                url=url,
-                exists=True,
-                is_active=True,
-                is_company_site=True,
-                status_code=status_code,
-                redirect_url=final_url if final_url != url else ""
+        Zwraca None, gdy zawiódł tylko TLS - host trafia wtedy do
+        _tls_broken, a wywołujący sprawdza stronę przez http://.
+        """
+        if isinstance(error, httpx.TimeoutException):
+            return self._failed(url, "Connection timeout")
+        if isinstance(error, httpx.ConnectError):
+            parsed = urlparse(url)
+            if _caused_by(error, socket.gaierror):
+                _remember_dns_failure(parsed.hostname or "")
+                return self._failed(url, "DNS resolution failed")
+            if url.startswith("https://") and _caused_by(error, ssl.SSLError):
+                self._tls_broken.add(parsed.netloc)
+                return None
+            return self._failed(url, "Connection failed")
+        if isinstance(error, (httpx.NetworkError, httpx.RemoteProtocolError)):
+            return self._failed(url, "Connection failed")
+        return self._failed(url, str(error))
+
+    @staticmethod
+    def _failed(url: str, error: str) -> WebsiteStatus:
+        """Status strony, której nie udało się sprawdzić."""
+        return WebsiteStatus(
+            url=url,
+            exists=False,
+            is_active=False,
+            is_company_site=False,
+            error=error
+        )
+
+    def _redirected_away(
+        self,
+        url: str,
+        response: httpx.Response
+    ) -> Optional[WebsiteStatus]:
+        """
+        Zwraca status, jeśli strona przekierowuje na social media lub katalog.
+
+        Sprawdza tylko końcowy URL, więc treści nie trzeba pobierać.
+        """
+        final_url = str(response.url)
+        if final_url == url or is_valid_website(final_url):
+            return None
+        return WebsiteStatus(
+            url=url,
+            exists=True,
+            is_active=False,
+            is_company_site=False,
+            status_code=response.status_code,
+            redirect_url=final_url,
+            error="Redirects to social/directory"
+        )
+
+    def _check_over_http(self, url: str) -> WebsiteStatus:
+        """Sprawdza stronę przez http:// (fallback, gdy TLS nie działa)."""
+        try:
+            with self.client.stream("GET", _http_url(url)) as response:
+                html, complete = _read_capped(response)
+            return self._http_fallback_status(
+                url, response.status_code, html, complete
             )
+        except Exception:
+            return self._failed(url, "SSL error")
+
+    def _http_fallback_status(
+        self,
+        url: str,
+        status_code: int,
+        html: str,
+        complete: bool
+    ) -> WebsiteStatus:
+        """Ocenia stronę pobraną przez http:// po błędzie TLS."""
+        return WebsiteStatus(
+            url=url,
+            exists=True,
+            is_active=status_code < 400,
+            is_company_site=not self._is_parking_page(html, complete),
+            status_code=status_code,
+            error="SSL error, fallback to HTTP"
+        )
+
+    def _classify_response(
+        self,
+        url: str,
+        status_code: int,
+        final_url: str,
+        html: str,
+        complete: bool = True
+    ) -> WebsiteStatus:
+        """
+        Ocenia pobraną stronę: błąd HTTP, parking, placeholder lub aktywna.
 
-        except requests.exceptions.Timeout:
+        complete=False oznacza, że html to tylko początek dłuższej strony.
+        """
+        # Sprawdź status code
+        if status_code >= 400:
             return WebsiteStatus(
                 url=url,
                 exists=False,
                 is_active=False,
                 is_company_site=False,
-                error="Connection timeout"
+                status_code=status_code,
+                error=f"HTTP error {status_code}"
             )
-        except requests.exceptions.SSLError:
-            # Próbuj bez SSL
-            try:
-                http_url = url.replace("https://", "http://")
-                response = requests.get(
-                    http_url,
-                    headers=get_headers(),
-                    timeout=self.timeout,
-                    allow_redirects=True
-                )
-                return WebsiteStatus(
-                    url=url,
-                    exists=True,
-                    is_active=response.status_code < 400,
-                    is_company_site=not self._is_parking_page(response.text),
-                    status_code=response.status_code,
-                    error="SSL error, fallback to HTTP"
-                )
-            except Exception:
-                return WebsiteStatus(
-                    url=url,
-                    exists=False,
-                    is_active=False,
-                    is_company_site=False,
-                    error="SSL error"
-                )
-        except requests.exceptions.ConnectionError:
+
+        # Sprawdź czy to parking domenowy
+        is_parked = self._is_parking_page(html, complete)
+        if is_parked:
             return WebsiteStatus(
                 url=url,
-                exists=False,
+                exists=True,
                 is_active=False,
                 is_company_site=False,
-                error="Connection failed"
+                status_code=status_code,
+                redirect_url=final_url if final_url != url else "",
+                error="Domain parking page detected"
             )
-        except Exception as e:
+
+        # Sprawdź czy to placeholder
+        is_placeholder = self._is_placeholder_page(html)
+        if is_placeholder:
             return WebsiteStatus(
                 url=url,
-                exists=False,
+                exists=True,
                 is_active=False,
                 is_company_site=False,
-                error=str(e)
+                status_code=status_code,
+                error="Placeholder/template page detected"
             )
 
-    def _normalize_url(self, url: str) -> str:
-        """Normalizuje URL dodając scheme jeśli brakuje."""
-        url = url.strip()
-        if not url:
-            return ""
+        # Strona istnieje i wygląda na aktywną
+        return WebsiteStatus(
+            url=url,
+            exists=True,
+            is_active=True,
+            is_company_site=True,
+            status_code=status_code,
+            redirect_url=final_url if final_url != url else ""
+        )
+
+    async def _acheck(self, client: httpx.AsyncClient, url: str) -> WebsiteStatus:
+        """Asynchroniczna wersja check_website() używana przez batch_check()."""
+        url, status = self._precheck(url)
+        if status:
+            return status
+
+        try:
+            if self._tls_known_broken(url):
+                return await self._acheck_over_http(client, url)
 
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
+            status = self._head_verdict(url, await client.head(url))
+            if status:
+                return status
 
-        return url
+            async with client.stream("GET", url) as response:
+                status = self._redirected_away(url, response)
+                if status:
+                    return status
+                html, complete = await _aread_capped(response)
 
-    def _is_parking_page(self, html: str) -> bool:
-        """Sprawdza czy strona to parking domenowy."""
-        html_lower = html.lower()
+            return self._classify_response(
+                url, response.status_code, str(response.url), html, complete
+            )
 
-        for pattern in self.PARKING_PATTERNS:
-            if re.search(pattern, html_lower, re.IGNORECASE):
-                return True
+        except Exception as e:
+            return self._error_status(url, e) or await self._acheck_over_http(client, url)
+
+    async def _acheck_over_http(
+        self,
+        client: httpx.AsyncClient,
+        url: str
+    ) -> WebsiteStatus:
+        """Asynchroniczna wersja _check_over_http()."""
+        try:
+            async with client.stream("GET", _http_url(url)) as response:
+                html, complete = await _aread_capped(response)
+            return self._http_fallback_status(
+                url, response.status_code, html, complete
+            )
+        except Exception:
+            return self._failed(url, "SSL error")
+
+    async def _abatch(
+        self,
+        urls: list,
+        concurrency: int,
+        rate: Optional[float] = None,
+        progress: Optional[Callable[[], None]] = None
+    ) -> List[WebsiteStatus]:
+        """Sprawdza URL-e współbieżnie na jednym kliencie z pulą połączeń."""
+        semaphore = asyncio.Semaphore(concurrency)
+        limiter = AsyncTokenBucket(rate=rate) if rate else None
+
+        async def limited(url: str) -> WebsiteStatus:
+            async with semaphore:
+                if limiter:
+                    await limiter.acquire()
+                status = await self._acheck(client, url)
+            if progress:
+                progress()
+            return status
+
+        async with httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            verify=False,  # Niektóre strony mają nieważne certyfikaty
+            headers=get_headers(),
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=100, max_keepalive_connections=50
+            ),
+        ) as client:
+            return await asyncio.gather(*(limited(url) for url in urls))
 
-        # Sprawdź też krótką zawartość (parking pages są często minimalne)
-        # Usuń tagi HTML i sprawdź długość tekstu
-        text_only = re.sub(r'<[^>]+>', '', html)
-        text_only = re.sub(r'\s+', ' ', text_only).strip()
+    def _normalize_url(self, url: str) -> str:
+        """Normalizuje URL dodając scheme jeśli brakuje."""
+        return _normalize_url_impl(url)
 
-        if len(text_only) < 100:
+    def _is_parking_page(self, html: str, complete: bool = True) -> bool:
+        """Sprawdza czy strona to parking domenowy."""
+        if self._parking_set.search(_scan_window(html)):
             return True
 
-        return False
+        # Sprawdź też krótką zawartość (parking pages są często minimalne).
+        # Strona dłuższa niż MAX_PAGE_BYTES nie jest minimalna, nawet jeśli
+        # jej początek to same skrypty i style
+        return complete and not _has_visible_text(html, 100)
 
     def _is_placeholder_page(self, html: str) -> bool:
         """Sprawdza czy strona to placeholder/template."""
-        html_lower = html.lower()
-
-        for pattern in self.PLACEHOLDER_PATTERNS:
-            if re.search(pattern, html_lower, re.IGNORECASE):
-                return True
-
-        return False
+        return self._placeholder_set.search(_scan_window(html))
 
     def extract_contacts_from_website(self, url: str) -> Dict:
         """
@@ -297,75 +560,272 @@ class WebsiteChecker:
         if not url:
             return result
 
+        # Deduplikacja przez dict (jak zbiór, ale zachowuje kolejność)
+        emails: Dict[str, None] = {}
+        phones: Dict[str, None] = {}
+
         try:
-            response = make_request(url, timeout=self.timeout)
-            if not response:
+            response = self.client.get(url)
+            if response.status_code >= 400:
                 return result
 
-            html = response.text
-
-            # Wyciągnij emaile
-            result["emails"] = extract_emails(html)
-
-            # Wyciągnij telefony
-            result["phones"] = extract_phones(html)
-
-            # Wyciągnij social media
-            result["social"] = extract_social_media(html)
+            # Wyciągnij emaile, telefony i social media
+            page_emails, page_phones, result["social"] = _extract_all(response.text)
+            emails.update(dict.fromkeys(page_emails))
+            phones.update(dict.fromkeys(page_phones))
 
             # Spróbuj też ze strony kontakt
+            base = url.rstrip('/')
             contact_urls = [
-                f"{url.rstrip('/')}/kontakt",
-                f"{url.rstrip('/')}/contact",
-                f"{url.rstrip('/')}/kontakt.html",
-                f"{url.rstrip('/')}/contact.html",
+                f"{base}/kontakt",
+                f"{base}/contact",
+                f"{base}/kontakt.html",
+                f"{base}/contact.html",
             ]
 
-            for contact_url in contact_urls:
-                try:
-                    contact_response = make_request(contact_url, timeout=5)
-                    if contact_response and contact_response.status_code == 200:
-                        contact_html = contact_response.text
-
-                        # Dodaj znalezione kontakty
-                        for email in extract_emails(contact_html):
-                            if email not in result["emails"]:
-                                result["emails"].append(email)
-
-                        for phone in extract_phones(contact_html):
-                            if phone not in result["phones"]:
-                                result["phones"].append(phone)
-
-                        contact_social = extract_social_media(contact_html)
-                        for platform, link in contact_social.items():
-                            if link and not result["social"].get(platform):
-                                result["social"][platform] = link
-
-                        break  # Znaleziono stronę kontakt
-
-                except Exception:
-                    continue
+            # Wszystkie warianty pobierane równolegle; wynik bierzemy
+            # z pierwszego działającego w kolejności listy
+            pool = ThreadPoolExecutor(max_workers=len(contact_urls))
+            try:
+                futures = [
+                    pool.submit(self._fetch_contact_page, contact_url)
+                    for contact_url in contact_urls
+                ]
+                for future in futures:
+                    contact_html = future.result()
+                    if contact_html is None:
+                        continue
+
+                    # Dodaj znalezione kontakty
+                    contact_emails, contact_phones, contact_social = _extract_all(contact_html)
+                    emails.update(dict.fromkeys(contact_emails))
+                    phones.update(dict.fromkeys(contact_phones))
+
+                    for platform, link in contact_social.items():
+                        if link and not result["social"].get(platform):
+                            result["social"][platform] = link
+
+                    break  # Znaleziono stronę kontakt
+            finally:
+                # Nie czekaj na pozostałe (wolniejsze) warianty
+                pool.shutdown(wait=False, cancel_futures=True)
 
         except Exception as e:
             logger.debug(f"Error extracting contacts from {url}: {e}")
 
+        result["emails"] = list(emails)
+        result["phones"] = list(phones)
         return result
 
-    def batch_check(self, urls: list) -> list:
+    def _fetch_contact_page(self, url: str) -> Optional[str]:
+        """Pobiera stronę kontaktową; None jeśli nie istnieje lub wystąpił błąd."""
+        try:
+            response = self.client.get(url, timeout=5)
+            if response.status_code == 200:
+                return response.text
+        except Exception:
+            pass
+        return None
+
+    def batch_check(
+        self,
+        urls: list,
+        concurrency: int = 50,
+        rate: Optional[float] = None,
+        progress: Optional[Callable[[], None]] = None
+    ) -> list:
         """
         Sprawdza wiele URL-i naraz.
 
+        Strony są pobierane współbieżnie (asyncio + httpx), więc czas
+        sprawdzania listy zależy od najwolniejszych stron, a nie od ich sumy.
+
         Args:
             urls: Lista URL-i do sprawdzenia
+            concurrency: Maksymalna liczba jednocześnie sprawdzanych stron
+            rate: Limit nowych sprawdzeń na sekundę (None = bez limitu)
+            progress: Wywoływane po sprawdzeniu każdej strony (np. tqdm.update)
 
         Returns:
-            Lista WebsiteStatus
+            Lista WebsiteStatus (w kolejności urls)
         """
-        results = []
-        for url in urls:
-            status = self.check_website(url)
-            results.append(status)
-        return results
+        if not urls:
+            return []
+        return asyncio.run(self._abatch(urls, concurrency, rate, progress))
+
+    def close(self):
+        """Zamyka klienta HTTP."""
+        self.client.close()
+
+
+def _extract_all(html: str) -> Tuple[List[str], List[str], Dict]:
+    """
+    Wyciąga ze strony emaile, telefony i linki social media.
+
+    Strona bez "@" nie zawiera adresu email - pomijamy wtedy cały
+    przebieg wyrażenia dla emaili.
+
+    Returns:
+        (emaile, telefony, social media)
+    """
+    emails = extract_emails(html) if "@" in html else []
+    return emails, extract_phones(html), extract_social_media(html)
+
+
+def _scan_window(html: str) -> str:
+    """Zwraca początek i koniec dużej strony (całą, jeśli jest mała)."""
+    if len(html) <= SCAN_HEAD_CHARS + SCAN_TAIL_CHARS:
+        return html
+    return html[:SCAN_HEAD_CHARS] + "\n" + html[-SCAN_TAIL_CHARS:]
+
+
+@lru_cache(maxsize=8192)
+def _normalize_url_impl(url: str) -> str:
+    """
+    Implementacja WebsiteChecker._normalize_url().
+
+    Ten sam URL przechodzi przez has_no_website(), check_website()
+    i extract_contacts_from_website() - wynik jest cache'owany.
+    """
+    url = url.strip()
+    if not url:
+        return ""
+
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+
+    return url
+
+
+def _read_capped(response: httpx.Response) -> Tuple[str, bool]:
+    """
+    Czyta najwyżej MAX_PAGE_BYTES treści odpowiedzi pobranej przez stream().
+
+    Returns:
+        (tekst strony, czy pobrano ją w całości)
+    """
+    chunks = []
+    size = 0
+    complete = True
+    try:
+        for chunk in response.iter_bytes(chunk_size=16384):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_PAGE_BYTES:
+                complete = False
+                break
+    finally:
+        response.close()
+
+    return _decode_capped(response, chunks), complete
+
+
+async def _aread_capped(response: httpx.Response) -> Tuple[str, bool]:
+    """Asynchroniczna wersja _read_capped()."""
+    chunks = []
+    size = 0
+    complete = True
+    try:
+        async for chunk in response.aiter_bytes(chunk_size=16384):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_PAGE_BYTES:
+                complete = False
+                break
+    finally:
+        await response.aclose()
+
+    return _decode_capped(response, chunks), complete
+
+
+def _decode_capped(response: httpx.Response, chunks: List[bytes]) -> str:
+    """Dekoduje pobrane fragmenty (najwyżej MAX_PAGE_BYTES) do tekstu."""
+    body = b"".join(chunks)[:MAX_PAGE_BYTES]
+    try:
+        return body.decode(response.encoding or "utf-8", errors="replace")
+    except LookupError:
+        # Nieznane kodowanie w nagłówku Content-Type
+        return body.decode("utf-8", errors="replace")
+
+
+def _http_url(url: str) -> str:
+    """Zamienia https:// na http:// (fallback po błędzie TLS)."""
+    return url.replace("https://", "http://")
+
+
+def _has_visible_text(html: str, min_chars: int) -> bool:
+    """
+    Sprawdza czy strona ma co najmniej min_chars znaków tekstu poza tagami.
+
+    Liczy tak jak usunięcie tagów i zwinięcie białych znaków do jednej
+    spacji, ale bez budowania kopii dokumentu - skacze między tagami
+    przez str.find i kończy, gdy tylko osiągnie limit.
+    """
+    count = 0
+    space_pending = False
+    pos = 0
+    length = len(html)
+
+    while pos < length:
+        # "<>" nie jest tagiem - szukaj dalej
+        tag_start = html.find("<", pos)
+        while tag_start != -1 and html.startswith(">", tag_start + 1):
+            tag_start = html.find("<", tag_start + 1)
+        tag_end = html.find(">", tag_start + 1) if tag_start != -1 else -1
+        if tag_end == -1:
+            # Brak (domkniętego) tagu - reszta to tekst
+            tag_start = length
+
+        segment = html[pos:tag_start]
+        words = segment.split()
+        if words:
+            if count and (space_pending or segment[0].isspace()):
+                count += 1
+            count += sum(map(len, words)) + len(words) - 1
+            if count >= min_chars:
+                return True
+            space_pending = segment[-1].isspace()
+        elif segment:
+            space_pending = True
+
+        pos = tag_end + 1 if tag_end != -1 else length
+
+    return False
+
+
+def _dns_failed_recently(host: str) -> bool:
+    """Sprawdza czy nazwa hosta nie rozwiązała się w ciągu DNS_NEGATIVE_TTL."""
+    expires = _dns_failures.get(host)
+    return expires is not None and expires > time.monotonic()
+
+
+def _remember_dns_failure(host: str) -> None:
+    """Zapamiętuje host, którego nazwa się nie rozwiązała."""
+    _dns_failures[host] = time.monotonic() + DNS_NEGATIVE_TTL
+
+
+def _caused_by(error: BaseException, cause: type) -> bool:
+    """Sprawdza czy w łańcuchu przyczyn błędu jest wyjątek danego typu."""
+    while error is not None:
+        if isinstance(error, cause):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+# Wspólny checker dla has_no_website() - jedna pula połączeń na cały skan
+_checker: Optional[WebsiteChecker] = None
+_checker_lock = threading.Lock()
+
+
+def _get_checker() -> WebsiteChecker:
+    """Zwraca współdzieloną instancję WebsiteChecker (tworzoną przy pierwszym użyciu)."""
+    global _checker
+    if _checker is None:
+        with _checker_lock:
+            if _checker is None:
+                _checker = WebsiteChecker(timeout=5)
+    return _checker
 
 
 def has_no_website(business_data: dict) -> bool:
@@ -383,7 +843,21 @@ def has_no_website(business_data: dict) -> bool:
     if not website:
         return True
 
-    checker = WebsiteChecker(timeout=5)
-    status = checker.check_website(website)
+    # Social media, katalogi itp. - bez łączenia się ze stroną
+    url = _normalize_url_impl(website)
+    if not is_valid_website(url):
+        return True
+
+    return _website_missing(url)
+
+
+@lru_cache(maxsize=4096)
+def _website_missing(url: str) -> bool:
+    """
+    Sprawdza stronę przez sieć; wynik zapamiętany per (znormalizowany) URL.
+
+    Ta sama strona często powtarza się w wielu wierszach danych.
+    """
+    status = _get_checker().check_website(url)
 
     return not (status.exists and status.is_active and status.is_company_site)
@@ -10,62 +10,28 @@ Ten moduł generuje spersonalizowane wiadomości dla:
 UWAGA: Automatyczne wysyłanie wiadomości może naruszać regulaminy platform!
 Używaj odpowiedzialnie i zgodnie z RODO/przepisami o marketingu.
 """
-from typing import Dict, Optional
+import os
+from concurrent.futures import ProcessPoolExecutor
+from string import Template
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass
-class MessageTemplates:
-    """Szablony wiadomości dla różnych kanałów."""
+# Od tylu firm opłaca się generowanie w osobnych procesach. Jedna firma
+# to ok. 15 µs, więc przy mniejszych partiach start procesów i przesyłanie
+# wyników kosztuje więcej niż same szablony
+PARALLEL_MIN_BATCH = 20000
 
-    # Dane nadawcy (dostosuj do swoich)
-    sender_name: str = "Jan Kowalski"
-    sender_company: str = "WebStudio Szczecin"
-    sender_email: str = "kontakt@webstudio.pl"
-    sender_phone: str = "+48 123 456 789"
-    sender_website: str = "https://webstudio.pl"
+# Treści szablonów. Pola nadawcy (${sender_*}) są wstawiane raz na instancję
+# MessageTemplates, ${name} i ${industry} - dla każdej firmy
+_EMAIL_STANDARD = """Dzień dobry,
 
-    def generate_email(self, business: Dict, template: str = "standard") -> Dict:
-        """
-        Generuje email do firmy.
+Piszę do Państwa w imieniu ${sender_company}.
 
-        Args:
-            business: Dane firmy
-            template: Typ szablonu (standard, short, premium)
+Zauważyłem, że firma ${name} nie posiada jeszcze własnej strony internetowej. W dzisiejszych czasach obecność online jest kluczowa dla rozwoju biznesu - ponad 80% klientów szuka usług i produktów w internecie przed podjęciem decyzji.
 
-        Returns:
-            Dict z polami: subject, body, to
-        """
-        name = business.get("name", "Szanowni Państwo")
-        industry = business.get("industry", "")
-
-        templates = {
-            "standard": self._email_standard(name, industry),
-            "short": self._email_short(name, industry),
-            "premium": self._email_premium(name, industry),
-        }
-
-        email_content = templates.get(template, templates["standard"])
-
-        return {
-            "to": business.get("email", ""),
-            "subject": email_content["subject"],
-            "body": email_content["body"],
-            "business_name": name,
-        }
-
-    def _email_standard(self, name: str, industry: str) -> Dict:
-        """Standardowy szablon emaila."""
-        subject = f"Propozycja współpracy - strona internetowa dla {name}"
-
-        body = f"""Dzień dobry,
-
-Piszę do Państwa w imieniu {self.sender_company}.
-
-Zauważyłem, że firma {name} nie posiada jeszcze własnej strony internetowej. W dzisiejszych czasach obecność online jest kluczowa dla rozwoju biznesu - ponad 80% klientów szuka usług i produktów w internecie przed podjęciem decyzji.
-
-Specjalizujemy się w tworzeniu profesjonalnych stron internetowych dla firm z branży {industry or 'usługowej'}. Oferujemy:
+Specjalizujemy się w tworzeniu profesjonalnych stron internetowych dla firm z branży ${industry}. Oferujemy:
 
 ✓ Nowoczesny, responsywny design dopasowany do Państwa marki
 ✓ Optymalizację pod wyszukiwarki (SEO) - żeby klienci łatwo Was znaleźli
@@ -76,25 +42,20 @@ Specjalizujemy się w tworzeniu profesjonalnych stron internetowych dla firm z b
 Czy moglibyśmy umówić się na krótką, niezobowiązującą rozmowę telefoniczną?
 
 Z poważaniem,
-{self.sender_name}
-{self.sender_company}
-Tel: {self.sender_phone}
-Email: {self.sender_email}
-{self.sender_website}
+${sender_name}
+${sender_company}
+Tel: ${sender_phone}
+Email: ${sender_email}
+${sender_website}
 
 ---
 Jeśli nie są Państwo zainteresowani, przepraszam za wiadomość.
 Proszę o odpowiedź "STOP" - więcej nie napiszę.
 """
-        return {"subject": subject, "body": body}
 
-    def _email_short(self, name: str, industry: str) -> Dict:
-        """Krótki szablon emaila."""
-        subject = f"Strona www dla {name}?"
+_EMAIL_SHORT = """Dzień dobry,
 
-        body = f"""Dzień dobry,
-
-Czy zastanawialiście się Państwo nad stworzeniem strony internetowej dla {name}?
+Czy zastanawialiście się Państwo nad stworzeniem strony internetowej dla ${name}?
 
 Pomagam lokalnym firmom ze Szczecina zaistnieć w internecie. Oferuję:
 • Profesjonalną stronę od 1500 zł
@@ -102,22 +63,17 @@ Pomagam lokalnym firmom ze Szczecina zaistnieć w internecie. Oferuję:
 • Bezpłatną konsultację
 
 Zainteresowani? Proszę o kontakt:
-{self.sender_phone} | {self.sender_email}
+${sender_phone} | ${sender_email}
 
 Pozdrawiam,
-{self.sender_name}
+${sender_name}
 """
-        return {"subject": subject, "body": body}
-
-    def _email_premium(self, name: str, industry: str) -> Dict:
-        """Premium szablon - dla większych firm."""
-        subject = f"Cyfrowa transformacja dla {name} - propozycja partnerstwa"
 
-        body = f"""Szanowni Państwo,
+_EMAIL_PREMIUM = """Szanowni Państwo,
 
-Analizując rynek {industry or 'lokalnych usług'} w Szczecinie, zwróciłem uwagę na firmę {name} jako lidera w swojej branży.
+Analizując rynek ${industry} w Szczecinie, zwróciłem uwagę na firmę ${name} jako lidera w swojej branży.
 
-Jako {self.sender_company}, specjalizujemy się w kompleksowej obecności online dla firm premium. Chciałbym zaproponować współpracę obejmującą:
+Jako ${sender_company}, specjalizujemy się w kompleksowej obecności online dla firm premium. Chciałbym zaproponować współpracę obejmującą:
 
 1. STRONA INTERNETOWA
    - Indywidualny projekt graficzny
@@ -139,76 +95,173 @@ Zapraszam na bezpłatną konsultację, podczas której przeanalizujemy Państwa
 Czy mogę zadzwonić w tym tygodniu?
 
 Z wyrazami szacunku,
-{self.sender_name}
-{self.sender_company}
-{self.sender_phone}
-{self.sender_website}
+${sender_name}
+${sender_company}
+${sender_phone}
+${sender_website}
 """
-        return {"subject": subject, "body": body}
 
-    def generate_instagram_dm(self, business: Dict) -> str:
-        """
-        Generuje wiadomość na Instagram DM.
-        Krótka i nieformalna.
-        """
-        name = business.get("name", "")
-
-        return f"""Cześć! 👋
+_INSTAGRAM_DM = """Cześć! 👋
 
-Prowadzę {self.sender_company} i pomagam lokalnym firmom ze Szczecina w tworzeniu stron internetowych.
+Prowadzę ${sender_company} i pomagam lokalnym firmom ze Szczecina w tworzeniu stron internetowych.
 
-Zauważyłem, że {name} nie ma jeszcze strony www. W dzisiejszych czasach to naprawdę pomaga dotrzeć do nowych klientów! 📱💻
+Zauważyłem, że ${name} nie ma jeszcze strony www. W dzisiejszych czasach to naprawdę pomaga dotrzeć do nowych klientów! 📱💻
 
 Jeśli byłoby zainteresowanie, chętnie opowiem więcej. Bez zobowiązań!
 
 Pozdrawiam,
-{self.sender_name}
+${sender_name}
 """
 
-    def generate_facebook_message(self, business: Dict) -> str:
-        """
-        Generuje wiadomość na Facebook Messenger.
-        Przyjaźniejszy ton.
-        """
-        name = business.get("name", "")
-        industry = business.get("industry", "")
-
-        return f"""Dzień dobry!
+_FACEBOOK_MESSAGE = """Dzień dobry!
 
-Piszę z {self.sender_company} - zajmujemy się tworzeniem stron internetowych dla firm z regionu Szczecina.
+Piszę z ${sender_company} - zajmujemy się tworzeniem stron internetowych dla firm z regionu Szczecina.
 
-Przeglądając {industry or 'lokalne firmy'}, trafiłem na {name}. Świetnie, że jesteście aktywni na Facebooku! 👍
+Przeglądając ${industry}, trafiłem na ${name}. Świetnie, że jesteście aktywni na Facebooku! 👍
 
 Zastanawiałem się, czy rozważaliście Państwo własną stronę www? To świetne uzupełnienie profilu na FB - klienci mogą łatwo znaleźć wszystkie informacje, a Google pokazuje Was w wynikach wyszukiwania.
 
 Jeśli temat jest ciekawy, chętnie porozmawiam - bez żadnych zobowiązań!
 
 Pozdrawiam serdecznie,
-{self.sender_name}
-📞 {self.sender_phone}
+${sender_name}
+📞 ${sender_phone}
 """
 
-    def generate_linkedin_message(self, business: Dict) -> str:
-        """
-        Generuje wiadomość na LinkedIn.
-        Profesjonalny ton B2B.
-        """
-        name = business.get("name", "")
-
-        return f"""Dzień dobry,
+_LINKEDIN_MESSAGE = """Dzień dobry,
 
 Łączę się z przedstawicielami lokalnych firm ze Szczecina, którym mogę pomóc w rozwoju obecności online.
 
-Zauważyłem, że {name} nie posiada jeszcze strony internetowej. W {self.sender_company} specjalizujemy się właśnie w tym - tworzymy profesjonalne strony, które pomagają firmom pozyskiwać nowych klientów.
+Zauważyłem, że ${name} nie posiada jeszcze strony internetowej. W ${sender_company} specjalizujemy się właśnie w tym - tworzymy profesjonalne strony, które pomagają firmom pozyskiwać nowych klientów.
 
 Czy byłaby Pani/Pan zainteresowana krótką rozmową na ten temat?
 
 Z poważaniem,
-{self.sender_name}
-{self.sender_company}
+${sender_name}
+${sender_company}
 """
 
 
+def _escape(value: str) -> str:
+    """Chroni "$" w danych nadawcy przed drugim podstawieniem."""
+    return value.replace("$", "$$")
+
+
+@dataclass
+class MessageTemplates:
+    """Szablony wiadomości dla różnych kanałów."""
+
+    # Dane nadawcy (dostosuj do swoich)
+    sender_name: str = "Jan Kowalski"
+    sender_company: str = "WebStudio Szczecin"
+    sender_email: str = "kontakt@webstudio.pl"
+    sender_phone: str = "+48 123 456 789"
+    sender_website: str = "https://webstudio.pl"
+
+    def __post_init__(self):
+        # Stała część wiadomości (dane nadawcy) wypełniana tylko raz -
+        # zmiana pól sender_* po utworzeniu obiektu nie jest uwzględniana
+        sender = {
+            "sender_name": _escape(self.sender_name),
+            "sender_company": _escape(self.sender_company),
+            "sender_email": _escape(self.sender_email),
+            "sender_phone": _escape(self.sender_phone),
+            "sender_website": _escape(self.sender_website),
+        }
+
+        def prepare(body: str) -> Template:
+            return Template(Template(body).safe_substitute(sender))
+
+        self._standard_tpl = prepare(_EMAIL_STANDARD)
+        self._short_tpl = prepare(_EMAIL_SHORT)
+        self._premium_tpl = prepare(_EMAIL_PREMIUM)
+        self._instagram_tpl = prepare(_INSTAGRAM_DM)
+        self._facebook_tpl = prepare(_FACEBOOK_MESSAGE)
+        self._linkedin_tpl = prepare(_LINKEDIN_MESSAGE)
+
+    def generate_email(self, business: Dict, template: str = "standard") -> Dict:
+        """
+        Generuje email do firmy.
+
+        Args:
+            business: Dane firmy
+            template: Typ szablonu (standard, short, premium)
+
+        Returns:
+            Dict z polami: subject, body, to
+        """
+        name = business.get("name", "Szanowni Państwo")
+        industry = business.get("industry", "")
+
+        # Generuj tylko wybrany szablon
+        templates = {
+            "standard": self._email_standard,
+            "short": self._email_short,
+            "premium": self._email_premium,
+        }
+
+        email_content = templates.get(template, self._email_standard)(name, industry)
+
+        return {
+            "to": business.get("email", ""),
+            "subject": email_content["subject"],
+            "body": email_content["body"],
+            "business_name": name,
+        }
+
+    def _email_standard(self, name: str, industry: str) -> Dict:
+        """Standardowy szablon emaila."""
+        subject = f"Propozycja współpracy - strona internetowa dla {name}"
+        body = self._standard_tpl.substitute(
+            name=name, industry=industry or 'usługowej'
+        )
+        return {"subject": subject, "body": body}
+
+    def _email_short(self, name: str, industry: str) -> Dict:
+        """Krótki szablon emaila."""
+        subject = f"Strona www dla {name}?"
+        body = self._short_tpl.substitute(name=name)
+        return {"subject": subject, "body": body}
+
+    def _email_premium(self, name: str, industry: str) -> Dict:
+        """Premium szablon - dla większych firm."""
+        subject = f"Cyfrowa transformacja dla {name} - propozycja partnerstwa"
+        body = self._premium_tpl.substitute(
+            name=name, industry=industry or 'lokalnych usług'
+        )
+        return {"subject": subject, "body": body}
+
+    def generate_instagram_dm(self, business: Dict) -> str:
+        """
+        Generuje wiadomość na Instagram DM.
+        Krótka i nieformalna.
+        """
+        name = business.get("name", "")
+
+        return self._instagram_tpl.substitute(name=name)
+
+    def generate_facebook_message(self, business: Dict) -> str:
+        """
+        Generuje wiadomość na Facebook Messenger.
+        Przyjaźniejszy ton.
+        """
+        name = business.get("name", "")
+        industry = business.get("industry", "")
+
+        return self._facebook_tpl.substitute(
+            name=name, industry=industry or 'lokalne firmy'
+        )
+
+    def generate_linkedin_message(self, business: Dict) -> str:
+        """
+        Generuje wiadomość na LinkedIn.
+        Profesjonalny ton B2B.
+        """
+        name = business.get("name", "")
+
+        return self._linkedin_tpl.substitute(name=name)
+
+
 class MessageGenerator:
     """
     Generator spersonalizowanych wiadomości dla listy firm.
@@ -250,6 +303,29 @@ class MessageGenerator:
             "linkedin": self.templates.generate_linkedin_message(business),
         }
 
+    def generate_batch(self, businesses: List[Dict]) -> List[Dict]:
+        """
+        Generuje wiadomości dla listy firm (w kolejności listy).
+
+        Duże partie na maszynach wielordzeniowych są dzielone między
+        procesy, mniejsze - generowane w bieżącym procesie.
+
+        Args:
+            businesses: Lista firm
+
+        Returns:
+            Lista słowników jak z generate_all_messages()
+        """
+        workers = min(os.cpu_count() or 1, 8)
+        if workers < 2 or len(businesses) < PARALLEL_MIN_BATCH:
+            return [self.generate_all_messages(b) for b in businesses]
+
+        chunksize = -(-len(businesses) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(
+                self.generate_all_messages, businesses, chunksize=chunksize
+            ))
+
     def export_messages_to_file(
         self,
         businesses: list,
@@ -262,41 +338,51 @@ class MessageGenerator:
             businesses: Lista firm
             output_path: Ścieżka do pliku wyjściowego
         """
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("=" * 70 + "\n")
-            f.write("WIADOMOŚCI DO WYSŁANIA\n")
-            f.write(f"Wygenerowano: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
-            f.write("=" * 70 + "\n\n")
+        # Duży bufor i jeden zapis na firmę zamiast kilkunastu małych
+        with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.write(
+                f"{'=' * 70}\n"
+                "WIADOMOŚCI DO WYSŁANIA\n"
+                f"Wygenerowano: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
+                f"{'=' * 70}\n\n"
+            )
 
             for i, business in enumerate(businesses, 1):
                 messages = self.generate_all_messages(business)
 
-                f.write(f"\n{'#' * 70}\n")
-                f.write(f"# FIRMA {i}: {messages['business']}\n")
-                f.write(f"{'#' * 70}\n\n")
+                parts = [
+                    f"\n{'#' * 70}\n"
+                    f"# FIRMA {i}: {messages['business']}\n"
+                    f"{'#' * 70}\n\n"
+                ]
 
                 # Email
                 email = messages["email"]
                 if email.get("to"):
-                    f.write("--- EMAIL ---\n")
-                    f.write(f"Do: {email['to']}\n")
-                    f.write(f"Temat: {email['subject']}\n\n")
-                    f.write(email['body'])
-                    f.write("\n\n")
+                    parts.append(
+                        "--- EMAIL ---\n"
+                        f"Do: {email['to']}\n"
+                        f"Temat: {email['subject']}\n\n"
+                        f"{email['body']}\n\n"
+                    )
 
                 # Instagram
                 if business.get("instagram"):
-                    f.write("--- INSTAGRAM DM ---\n")
-                    f.write(f"Profil: {business['instagram']}\n\n")
-                    f.write(messages["instagram"])
-                    f.write("\n\n")
+                    parts.append(
+                        "--- INSTAGRAM DM ---\n"
+                        f"Profil: {business['instagram']}\n\n"
+                        f"{messages['instagram']}\n\n"
+                    )
 
                 # Facebook
                 if business.get("facebook"):
-                    f.write("--- FACEBOOK MESSENGER ---\n")
-                    f.write(f"Profil: {business['facebook']}\n\n")
-                    f.write(messages["facebook"])
-                    f.write("\n\n")
+                    parts.append(
+                        "--- FACEBOOK MESSENGER ---\n"
+                        f"Profil: {business['facebook']}\n\n"
+                        f"{messages['facebook']}\n\n"
+                    )
+
+                f.write("".join(parts))
 
         print(f"Wiadomości zapisane do: {output_path}")
 
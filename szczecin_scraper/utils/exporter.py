@@ -6,25 +6,78 @@ Obsługiwane formaty:
 - Excel (XLSX)
 - Word (DOCX)
 - JSON
+- Parquet / NDJSON (strumieniowo, dla dużych skanów)
 """
-import csv
 import json
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 from datetime import datetime
 
 import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
 from docx import Document
 from docx.shared import Inches, Pt
 from docx.enum.table import WD_TABLE_ALIGNMENT
 
-import sys
-sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
-from config import OUTPUT_DIR
+from szczecin_scraper.config import OUTPUT_DIR
 
 logger = logging.getLogger(__name__)
 
+# Pola tekstowe rekordu Business (kolejność = kolejność kolumn w Parquet)
+STRING_FIELDS = [
+    "name", "industry", "address", "phone", "email", "website",
+    "facebook", "instagram", "linkedin", "source",
+]
+
+# Rekordy o tych samych wartościach tych pól traktujemy jako duplikaty
+DEDUP_COLUMNS = ["name", "address", "phone"]
+
+# Wartości logiczne w eksportowanych tabelach
+_YES_NO = {True: "Tak", False: "Nie"}
+
+# Wyniki infer_dtype, które wykluczają wartości logiczne w kolumnie
+_NO_BOOL_DTYPES = frozenset(
+    {"string", "empty", "integer", "floating", "mixed-integer-float"}
+)
+
+
+def to_dataframe(businesses: Iterable) -> pd.DataFrame:
+    """
+    Buduje DataFrame z firm (obiekty Business lub słowniki) bez duplikatów.
+
+    Duplikaty (ta sama nazwa, adres i telefon) są usuwane wektorowo
+    przez pandas zamiast porównywania rekordów w pętli.
+    """
+    records = [
+        biz.to_dict() if hasattr(biz, "to_dict") else biz
+        for biz in businesses
+    ]
+    df = pd.DataFrame.from_records(records)
+
+    subset = [col for col in DEDUP_COLUMNS if col in df.columns]
+    if subset:
+        df.drop_duplicates(subset=subset, inplace=True, ignore_index=True)
+    return df
+
 
 class DataExporter:
     """
@@ -68,7 +121,7 @@ class DataExporter:
         Args:
             businesses: Lista firm do eksportu
             filename: Nazwa pliku (bez rozszerzenia)
-            format: Format wyjściowy (csv, xlsx, docx, json)
+            format: Format wyjściowy (csv, xlsx, docx, json, parquet)
 
         Returns:
             Ścieżka do utworzonego pliku
@@ -85,6 +138,7 @@ class DataExporter:
             "docx": self._export_docx,
             "word": self._export_docx,
             "json": self._export_json,
+            "parquet": self._export_parquet,
         }
 
         if format not in exporters:
@@ -92,35 +146,49 @@ class DataExporter:
 
         return exporters[format](businesses, filename)
 
+    def _prepare_frame(self, businesses: List[Dict]) -> pd.DataFrame:
+        """
+        Przygotowuje dane do eksportu jako DataFrame z etykietami kolumn.
+
+        Konwersje są wykonywane na całych kolumnach, nie komórka po komórce.
+        """
+        keys = [key for key, _ in self.COLUMNS]
+        # dtype=object - liczby z brakami nie są zamieniane na float
+        df = pd.DataFrame(businesses, columns=keys, dtype=object)
+
+        for key in keys:
+            column = df[key]
+            # Typ kolumny ustalany w C - kolumny bez wartości logicznych
+            # (prawie wszystkie) pomijają sprawdzanie komórka po komórce
+            if pd.api.types.infer_dtype(column, skipna=True) in _NO_BOOL_DTYPES:
+                continue
+            # Konwertuj boolean na tekst
+            is_bool = column.map(lambda value: isinstance(value, bool))
+            if is_bool.any():
+                df[key] = column.where(~is_bool, column[is_bool].map(_YES_NO))
+
+        # Puste/brakujące wartości jako ""
+        df = df.fillna("")
+        df = df.where(df.astype(bool), "")
+        df.columns = [label for _, label in self.COLUMNS]
+        return df
+
     def _prepare_data(self, businesses: List[Dict]) -> List[Dict]:
         """Przygotowuje dane do eksportu."""
-        prepared = []
-        for biz in businesses:
-            row = {}
-            for key, label in self.COLUMNS:
-                value = biz.get(key, "")
-                # Konwertuj boolean na tekst
-                if isinstance(value, bool):
-                    value = "Tak" if value else "Nie"
-                row[label] = value or ""
-            prepared.append(row)
-        return prepared
+        return self._prepare_frame(businesses).to_dict("records")
 
     def _export_csv(self, businesses: List[Dict], filename: str) -> Path:
         """Eksportuje do CSV."""
         filepath = self.output_dir / f"{filename}.csv"
-        data = self._prepare_data(businesses)
+        df = self._prepare_frame(businesses)
 
-        if not data:
+        if df.empty:
             logger.warning("No data to export")
             return filepath
 
-        headers = [label for _, label in self.COLUMNS]
-
-        with open(filepath, "w", newline="", encoding="utf-8-sig") as f:
-            writer = csv.DictWriter(f, fieldnames=headers, delimiter=";")
-            writer.writeheader()
-            writer.writerows(data)
+        # Zapis przez pandas (writer w C); "\r\n" jak dotychczas z modułu csv
+        with open(filepath, "w", newline="", encoding="utf-8-sig", buffering=1 << 20) as f:
+            df.to_csv(f, sep=";", index=False, lineterminator="\r\n")
 
         logger.info(f"Exported {len(businesses)} businesses to {filepath}")
         return filepath
@@ -128,45 +196,77 @@ class DataExporter:
     def _export_xlsx(self, businesses: List[Dict], filename: str) -> Path:
         """Eksportuje do Excel."""
         filepath = self.output_dir / f"{filename}.xlsx"
-        data = self._prepare_data(businesses)
+        df = self._prepare_frame(businesses)
 
-        if not data:
+        if df.empty:
             logger.warning("No data to export")
             # Utwórz pusty plik
             pd.DataFrame().to_excel(filepath, index=False)
             return filepath
 
-        df = pd.DataFrame(data)
-
-        # Zapisz z formatowaniem
-        with pd.ExcelWriter(filepath, engine="openpyxl") as writer:
-            df.to_excel(writer, sheet_name="Firmy", index=False)
-
-            # Formatowanie
-            worksheet = writer.sheets["Firmy"]
-
-            # Szerokość kolumn
-            column_widths = {
-                "Nazwa firmy": 30,
-                "Branża": 20,
-                "Adres": 40,
-                "Telefon": 15,
-                "Email": 30,
-                "Facebook": 35,
-                "Instagram": 30,
-                "LinkedIn": 35,
-                "Strona WWW": 35,
-                "Ma stronę?": 12,
-                "Źródło": 15,
-            }
-
-            for idx, col in enumerate(df.columns):
-                width = column_widths.get(col, 20)
-                worksheet.column_dimensions[chr(65 + idx)].width = width
+        # Szerokość kolumn
+        column_widths = {
+            "Nazwa firmy": 30,
+            "Branża": 20,
+            "Adres": 40,
+            "Telefon": 15,
+            "Email": 30,
+            "Facebook": 35,
+            "Instagram": 30,
+            "LinkedIn": 35,
+            "Strona WWW": 35,
+            "Ma stronę?": 12,
+            "Źródło": 15,
+        }
+
+        # Szerokości w kolejności kolumn - wyznaczane raz
+        widths = [column_widths.get(col, 20) for col in df.columns]
+
+        if XLSXWRITER_AVAILABLE:
+            self._write_xlsx_rows(df, filepath, widths)
+        else:
+            from openpyxl.utils import get_column_letter
+
+            # Zapisz z formatowaniem
+            with pd.ExcelWriter(filepath, engine="openpyxl") as writer:
+                df.to_excel(writer, sheet_name="Firmy", index=False)
+
+                # Formatowanie
+                worksheet = writer.sheets["Firmy"]
+
+                for idx, width in enumerate(widths, 1):
+                    worksheet.column_dimensions[get_column_letter(idx)].width = width
 
         logger.info(f"Exported {len(businesses)} businesses to {filepath}")
         return filepath
 
+    def _write_xlsx_rows(
+        self, df: pd.DataFrame, filepath: Path, widths: List[int]
+    ) -> None:
+        """
+        Zapisuje arkusz przez xlsxwriter w trybie constant_memory.
+
+        Wiersze trafiają na dysk jeden po drugim, więc pamięć nie rośnie
+        z liczbą firm. df.to_excel() pisze kolumnami, co w tym trybie
+        gubi dane - dlatego wiersze zapisujemy sami.
+        """
+        workbook = xlsxwriter.Workbook(str(filepath), {"constant_memory": True})
+        try:
+            worksheet = workbook.add_worksheet("Firmy")
+
+            # Sąsiednie kolumny o tej samej szerokości - jedno set_column
+            first = 0
+            for idx in range(1, len(widths) + 1):
+                if idx == len(widths) or widths[idx] != widths[first]:
+                    worksheet.set_column(first, idx - 1, widths[first])
+                    first = idx
+
+            worksheet.write_row(0, 0, df.columns)
+            for row, values in enumerate(df.itertuples(index=False, name=None), 1):
+                worksheet.write_row(row, 0, values)
+        finally:
+            workbook.close()
+
     def _export_docx(self, businesses: List[Dict], filename: str) -> Path:
         """Eksportuje do dokumentu Word."""
         filepath = self.output_dir / f"{filename}.docx"
@@ -200,14 +300,16 @@ class DataExporter:
         for industry, biz_list in sorted(by_industry.items()):
             doc.add_heading(f"{industry} ({len(biz_list)})", level=1)
 
-            # Tabela dla branży
-            table = doc.add_table(rows=1, cols=5)
+            # Tabela dla branży - wszystkie wiersze tworzone od razu
+            table = doc.add_table(rows=1 + len(biz_list), cols=5)
             table.style = "Table Grid"
             table.alignment = WD_TABLE_ALIGNMENT.LEFT
+            # table.rows[i] buduje listę wszystkich wierszy - pobieramy ją raz
+            rows = list(table.rows)
 
             # Nagłówki
             headers = ["Nazwa", "Adres", "Telefon", "Email", "Social Media"]
-            header_cells = table.rows[0].cells
+            header_cells = rows[0].cells
             for i, header in enumerate(headers):
                 header_cells[i].text = header
                 # Pogrubienie nagłówków
@@ -216,8 +318,8 @@ class DataExporter:
                         run.bold = True
 
             # Dane
-            for biz in biz_list:
-                row = table.add_row().cells
+            for table_row, biz in zip(rows[1:], biz_list):
+                row = table_row.cells
 
                 row[0].text = biz.get("Nazwa firmy", "")
                 row[1].text = biz.get("Adres", "")
@@ -251,12 +353,124 @@ class DataExporter:
             "businesses": businesses,
         }
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
+        if ORJSON_AVAILABLE:
+            # orjson zapisuje od razu bajty UTF-8 (bez escape'owania znaków)
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(output, f, ensure_ascii=False, indent=2)
 
         logger.info(f"Exported {len(businesses)} businesses to {filepath}")
         return filepath
 
+    def _export_parquet(self, businesses: List[Dict], filename: str) -> Path:
+        """Eksportuje do Parquet (bez duplikatów, kolumny liczbowe w typach natywnych)."""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Eksport Parquet wymaga pakietu pyarrow")
+
+        filepath = self.output_dir / f"{filename}.parquet"
+
+        df = to_dataframe(businesses)
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), filepath)
+
+        logger.info(f"Exported {len(df)} businesses to {filepath}")
+        return filepath
+
+    def stream_parquet(
+        self,
+        businesses: Iterable,
+        filename: str = None,
+        batch_size: int = 1000
+    ) -> Path:
+        """
+        Zapisuje firmy do Parquet w miarę ich napływania ze scrapera.
+
+        Rekordy są zbierane kolumnowo i zrzucane co batch_size wierszy,
+        więc w pamięci nigdy nie ma całej listy firm.
+
+        Args:
+            businesses: Generator obiektów Business lub słowników
+            filename: Nazwa pliku (bez rozszerzenia)
+            batch_size: Liczba wierszy w jednej grupie Parquet
+
+        Returns:
+            Ścieżka do utworzonego pliku
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Eksport Parquet wymaga pakietu pyarrow")
+
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"firmy_szczecin_{timestamp}"
+
+        filepath = self.output_dir / f"{filename}.parquet"
+        schema = pa.schema(
+            [pa.field(name, pa.string()) for name in STRING_FIELDS]
+            + [
+                pa.field("rating", pa.float32()),
+                pa.field("reviews_count", pa.int32()),
+                pa.field("has_website", pa.bool_()),
+            ]
+        )
+        columns = {name: [] for name in schema.names}
+        total = 0
+
+        with pq.ParquetWriter(filepath, schema) as writer:
+            for biz in businesses:
+                row = biz.to_dict() if hasattr(biz, "to_dict") else biz
+                for name in STRING_FIELDS:
+                    columns[name].append(row.get(name) or "")
+                columns["rating"].append(row.get("rating") or 0.0)
+                columns["reviews_count"].append(row.get("reviews_count") or 0)
+                columns["has_website"].append(bool(row.get("has_website")))
+                total += 1
+
+                if total % batch_size == 0:
+                    writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                    columns = {name: [] for name in schema.names}
+
+            if columns["name"]:
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+        logger.info(f"Exported {total} businesses to {filepath}")
+        return filepath
+
+    def stream_ndjson(self, businesses: Iterable, filename: str = None) -> Path:
+        """
+        Zapisuje firmy do NDJSON (jeden obiekt JSON na linię) strumieniowo.
+
+        Args:
+            businesses: Generator obiektów Business lub słowników
+            filename: Nazwa pliku (bez rozszerzenia)
+
+        Returns:
+            Ścieżka do utworzonego pliku
+        """
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"firmy_szczecin_{timestamp}"
+
+        filepath = self.output_dir / f"{filename}.ndjson"
+        total = 0
+
+        if ORJSON_AVAILABLE:
+            with open(filepath, "wb") as f:
+                for biz in businesses:
+                    row = biz.to_dict() if hasattr(biz, "to_dict") else biz
+                    f.write(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE))
+                    total += 1
+        else:
+            with open(filepath, "w", encoding="utf-8") as f:
+                for biz in businesses:
+                    row = biz.to_dict() if hasattr(biz, "to_dict") else biz
+                    f.write(json.dumps(row, ensure_ascii=False))
+                    f.write("\n")
+                    total += 1
+
+        logger.info(f"Exported {total} businesses to {filepath}")
+        return filepath
+
     def export_summary(self, businesses: List[Dict], filename: str = None) -> Path:
         """
         Eksportuje podsumowanie statystyczne.
@@ -274,19 +488,24 @@ class DataExporter:
 
         filepath = self.output_dir / f"{filename}.txt"
 
-        # Statystyki
-        total = len(businesses)
-        with_email = sum(1 for b in businesses if b.get("email"))
-        with_phone = sum(1 for b in businesses if b.get("phone"))
-        with_facebook = sum(1 for b in businesses if b.get("facebook"))
-        with_instagram = sum(1 for b in businesses if b.get("instagram"))
-        without_website = sum(1 for b in businesses if not b.get("has_website"))
+        # Statystyki - jedno przejście po rekordach, potem jedna redukcja
+        # wszystkich kolumn naraz (puste i brakujące wartości = False)
+        flags = ["email", "phone", "facebook", "instagram", "has_website"]
+        df = pd.DataFrame.from_records(businesses, columns=flags + ["industry"])
+        filled = (df[flags].notna() & df[flags].astype(bool)).sum()
 
-        # Grupuj po branżach
-        by_industry = {}
-        for b in businesses:
-            ind = b.get("industry", "Inne")
-            by_industry[ind] = by_industry.get(ind, 0) + 1
+        total = len(businesses)
+        with_email = int(filled["email"])
+        with_phone = int(filled["phone"])
+        with_facebook = int(filled["facebook"])
+        with_instagram = int(filled["instagram"])
+        without_website = total - int(filled["has_website"])
+
+        # Grupuj po branżach (brak branży = "Inne")
+        by_industry = (
+            df["industry"].astype(object).fillna("Inne")
+            .value_counts(sort=False).to_dict()
+        )
 
         with open(filepath, "w", encoding="utf-8") as f:
             f.write("=" * 50 + "\n")
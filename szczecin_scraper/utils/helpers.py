@@ -1,30 +1,73 @@
 """
 Funkcje pomocnicze dla scrapera
 """
+import asyncio
+import csv
+import hashlib
+import pickle
 import random
+import threading
 import time
 import logging
-from typing import Optional, Dict, Any
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, Sequence, Set, Union
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
 
-import requests
+import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-import sys
-sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
-from config import (
+from szczecin_scraper.config import (
     REQUEST_DELAY_MIN,
     REQUEST_DELAY_MAX,
+    REQUEST_RATE,
+    REQUEST_BURST,
+    RESPECT_ROBOTS_TXT,
     USER_AGENTS,
     USE_PROXY,
     PROXY_URL,
 )
 
+try:
+    import h2  # noqa: F401 - wymagane przez httpx dla HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Konfiguracja loggera
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
+# httpx loguje każde żądanie na poziomie INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Litery, których NFKD nie rozkłada do ASCII (ł) + typowe polskie znaki
+_PL_TRANS = str.maketrans({
+    "ł": "l", "Ł": "l", "ą": "a", "ę": "e", "ś": "s", "ć": "c",
+    "ń": "n", "ó": "o", "ź": "z", "ż": "z",
+})
+
+
+class _PhoneChars(dict):
+    """
+    Tablica dla str.translate: zostawia cyfry i "+", resztę usuwa.
+
+    Decyzja dla każdego znaku liczona jest raz i zapamiętywana, więc
+    kolejne numery filtruje samo str.translate w C.
+    """
+
+    def __missing__(self, code: int) -> Optional[int]:
+        char = chr(code)
+        value = code if char.isdigit() or char == "+" else None
+        self[code] = value
+        return value
+
+
+_PHONE_CHARS = _PhoneChars()
 
 
 def random_delay(min_delay: float = None, max_delay: float = None) -> None:
@@ -39,6 +82,79 @@ def random_delay(min_delay: float = None, max_delay: float = None) -> None:
     time.sleep(delay)
 
 
+class TokenBucket:
+    """
+    Limiter żądań typu token bucket, bezpieczny dla wielu wątków.
+
+    W przeciwieństwie do random_delay() czeka tylko wtedy, gdy limit
+    został faktycznie wyczerpany. Jedna instancja współdzielona przez
+    kilka wątków ogranicza ich łączną przepustowość do `rate` żądań/s.
+    """
+
+    def __init__(self, rate: float = REQUEST_RATE, burst: int = REQUEST_BURST):
+        """
+        Args:
+            rate: Liczba żądań na sekundę
+            burst: Maksymalna liczba żądań wysłanych bez czekania
+        """
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blokuje do czasu, aż dostępny będzie token."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket dla kodu asyncio.
+
+    Czekające zadania oddają pętlę zdarzeń (asyncio.sleep), więc wiele
+    żądań może być w toku naraz, a łączne tempo nie przekracza `rate`.
+    Przed wysłaniem żądania wywołaj `await limiter.acquire()`.
+    """
+
+    def __init__(self, rate: float = REQUEST_RATE, burst: int = REQUEST_BURST):
+        """
+        Args:
+            rate: Liczba żądań na sekundę
+            burst: Maksymalna liczba żądań wysłanych bez czekania
+        """
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Czeka (bez blokowania pętli), aż dostępny będzie token."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
 def get_random_user_agent() -> str:
     """Zwraca losowy User-Agent dla symulacji różnych przeglądarek."""
     return random.choice(USER_AGENTS)
@@ -58,16 +174,92 @@ def get_headers() -> Dict[str, str]:
     }
 
 
-def get_proxies() -> Optional[Dict[str, str]]:
-    """Zwraca konfigurację proxy jeśli jest włączona."""
+def get_proxy() -> Optional[str]:
+    """Zwraca adres proxy jeśli jest włączone."""
     if USE_PROXY and PROXY_URL:
-        return {
-            "http": PROXY_URL,
-            "https": PROXY_URL,
-        }
+        return PROXY_URL
     return None
 
 
+def create_session(pool_size: int = 10) -> httpx.Client:
+    """
+    Tworzy klienta HTTP z pulą połączeń keep-alive (HTTP/2 jeśli dostępne).
+
+    Kolejne żądania do tego samego hosta używają otwartego już połączenia,
+    więc nie płacimy za nowy handshake TCP/TLS przy każdej stronie.
+    Przez HTTP/2 wiele żądań idzie jednym połączeniem.
+    """
+    return httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        proxy=get_proxy(),
+        timeout=30,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size
+        ),
+    )
+
+
+_default_session: Optional[httpx.Client] = None
+_default_session_lock = threading.Lock()
+
+
+def _get_default_session() -> httpx.Client:
+    """Wspólny klient dla wywołań bez własnej sesji."""
+    global _default_session
+    if _default_session is None:
+        with _default_session_lock:
+            if _default_session is None:
+                _default_session = create_session(pool_size=100)
+    return _default_session
+
+
+def robots_allows(
+    url: str,
+    cache: Dict[str, RobotFileParser],
+    session: Optional[httpx.Client] = None
+) -> bool:
+    """
+    Sprawdza w robots.txt hosta, czy URL wolno pobrać.
+
+    robots.txt jest pobierany raz na host i trzymany w przekazanym cache.
+
+    Args:
+        url: URL do sprawdzenia
+        cache: Słownik host -> RobotFileParser
+        session: Sesja HTTP do pobrania robots.txt
+
+    Returns:
+        True jeśli pobranie jest dozwolone (lub sprawdzanie wyłączone)
+    """
+    if not RESPECT_ROBOTS_TXT:
+        return True
+
+    parsed = urlparse(url)
+    host = f"{parsed.scheme}://{parsed.netloc}"
+
+    parser = cache.get(host)
+    if parser is None:
+        parser = RobotFileParser(f"{host}/robots.txt")
+        try:
+            response = (session or _get_default_session()).get(
+                f"{host}/robots.txt", headers=get_headers(), timeout=10
+            )
+            # Jak RobotFileParser.read(): 401/403 blokuje wszystko, brak pliku nic
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif response.status_code < 400:
+                parser.parse(response.text.splitlines())
+            else:
+                parser.allow_all = True
+        except httpx.HTTPError as e:
+            logger.debug(f"Nie udało się pobrać robots.txt dla {host}: {e}")
+            parser.allow_all = True
+        cache[host] = parser
+
+    return parser.can_fetch("*", url)
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -81,7 +273,9 @@ def make_request(
     json_data: Dict = None,
     timeout: int = 30,
     allow_redirects: bool = True,
-) -> Optional[requests.Response]:
+    stream: bool = False,
+    session: Optional[httpx.Client] = None,
+) -> Optional[httpx.Response]:
     """
     Wykonuje request HTTP z obsługą retry i rate limiting.
 
@@ -93,47 +287,84 @@ def make_request(
         json_data: Dane JSON
         timeout: Timeout w sekundach
         allow_redirects: Czy podążać za przekierowaniami
+        stream: Nie pobieraj treści od razu (czytaj przez read_body)
+        session: Klient HTTP (keep-alive); domyślnie wspólny klient modułu
 
     Returns:
         Response object lub None w przypadku błędu
     """
     try:
-        headers = get_headers()
-        proxies = get_proxies()
-
-        response = requests.request(
-            method=method,
-            url=url,
-            headers=headers,
+        client = session or _get_default_session()
+        # User-Agent losowany per żądanie, nie na kliencie
+        request = client.build_request(
+            method,
+            url,
+            headers=get_headers(),
             params=params,
             data=data,
             json=json_data,
             timeout=timeout,
-            proxies=proxies,
-            allow_redirects=allow_redirects,
+        )
+        response = client.send(
+            request, stream=stream, follow_redirects=allow_redirects
         )
 
         # Sprawdź status
         if response.status_code == 429:
             logger.warning(f"Rate limit hit for {url}. Waiting longer...")
+            response.close()
             time.sleep(30)  # Dłuższa przerwa przy rate limit
-            raise requests.exceptions.RequestException("Rate limited")
+            raise httpx.HTTPError("Rate limited")
 
         if response.status_code == 403:
             logger.warning(f"Access forbidden for {url}. Might be blocked.")
+            response.close()
             return None
 
-        response.raise_for_status()
+        if response.is_error:
+            response.close()
+            response.raise_for_status()
         return response
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error(f"Timeout for {url}")
         return None
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Request error for {url}: {e}")
         raise
 
 
+def read_body(response: httpx.Response, chunk_size: int = 16384) -> bytes:
+    """
+    Czyta treść odpowiedzi (także pobranej ze stream=True) jako bajty.
+
+    Parser dostaje surowe bajty, więc nie powstaje dodatkowa kopia
+    strony jako str.
+    """
+    try:
+        return b"".join(response.iter_bytes(chunk_size=chunk_size))
+    finally:
+        response.close()
+
+
+def abs_url(base: str, href: str) -> str:
+    """
+    Zamienia link ze strony na pełny URL.
+
+    Typowe przypadki (pełny URL, ścieżka od "/") obsługuje bez parsowania;
+    pozostałe względne linki przekazuje do urljoin.
+
+    Args:
+        base: Adres główny serwisu (bez ścieżki), np. "https://panoramafirm.pl"
+        href: Wartość atrybutu href
+    """
+    if href.startswith(("http://", "https://")):
+        return href
+    if href.startswith("/") and not href.startswith("//"):
+        return base.rstrip("/") + href
+    return urljoin(base, href)
+
+
 def clean_text(text: str) -> str:
     """Czyści tekst z nadmiarowych białych znaków."""
     if not text:
@@ -141,12 +372,32 @@ def clean_text(text: str) -> str:
     return " ".join(text.split()).strip()
 
 
+@lru_cache(maxsize=4096)
+def slugify(text: str) -> str:
+    """
+    Zamienia tekst na slug URL bez polskich znaków.
+
+    Wynik jest cache'owany - te same nazwy miast i branż wracają
+    przy każdym zapytaniu.
+
+    Przykład: "Łódź Bałuty" -> "lodz-baluty"
+    """
+    if not text:
+        return ""
+    ascii_text = (
+        unicodedata.normalize("NFKD", text.translate(_PL_TRANS))
+        .encode("ascii", "ignore")
+        .decode()
+    )
+    return "-".join(ascii_text.lower().split())
+
+
 def normalize_phone(phone: str) -> str:
     """Normalizuje numer telefonu do standardowego formatu."""
     if not phone:
         return ""
     # Usuń wszystko poza cyframi i +
-    cleaned = "".join(c for c in phone if c.isdigit() or c == "+")
+    cleaned = phone.translate(_PHONE_CHARS)
     # Dodaj prefix +48 jeśli brakuje
     if cleaned and not cleaned.startswith("+"):
         if cleaned.startswith("48") and len(cleaned) == 11:
@@ -154,3 +405,77 @@ def normalize_phone(phone: str) -> str:
         elif len(cleaned) == 9:
             cleaned = "+48" + cleaned
     return cleaned
+
+
+def make_dedup_key(*parts: str) -> bytes:
+    """
+    Buduje klucz deduplikacji firmy (np. z nazwy i telefonu lub place_id).
+
+    Zamiast pełnych napisów trzymamy 16-bajtowy skrót blake2b,
+    co utrzymuje zbiór widzianych firm mały nawet przy wielu zapytaniach.
+    """
+    raw = "|".join((part or "").lower().strip() for part in parts)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
+
+
+def load_seen_keys(path: Optional[Path]) -> Set[bytes]:
+    """Wczytuje zapisane klucze deduplikacji z poprzednich uruchomień."""
+    if not path or not Path(path).exists():
+        return set()
+    try:
+        with open(path, "rb") as f:
+            return set(pickle.load(f))
+    except Exception as e:
+        logger.warning(f"Nie udało się wczytać {path}: {e}")
+        return set()
+
+
+def save_seen_keys(keys: Set[bytes], path: Optional[Path]) -> None:
+    """Zapisuje klucze deduplikacji na dysk (deduplikacja między sesjami)."""
+    if not path:
+        return
+    with open(path, "wb") as f:
+        pickle.dump(keys, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def crawl_to_csv(
+    businesses: Iterable,
+    out_path: Union[str, Path],
+    fieldnames: Sequence[str],
+    chunk: int = 64
+) -> int:
+    """
+    Zapisuje firmy do pliku CSV partiami po `chunk` wierszy.
+
+    Firmy są pobierane z iteratora na bieżąco, więc w pamięci jest
+    najwyżej jedna partia wierszy.
+
+    Args:
+        businesses: Firmy (obiekty z to_dict()), np. z search_businesses()
+        out_path: Ścieżka pliku CSV
+        fieldnames: Kolumny pliku
+        chunk: Liczba wierszy zapisywanych naraz
+
+    Returns:
+        Liczba zapisanych firm
+    """
+    count = 0
+    buffer = []
+
+    with open(out_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=";")
+        writer.writeheader()
+
+        for business in businesses:
+            buffer.append(business.to_dict())
+            if len(buffer) >= chunk:
+                writer.writerows(buffer)
+                count += len(buffer)
+                buffer.clear()
+
+        if buffer:
+            writer.writerows(buffer)
+            count += len(buffer)
+
+    logger.info(f"Saved {count} businesses to {out_path}")
+    return count
@@ -0,0 +1,87 @@
+"""
+Parsowanie HTML dla scraperów (selectolax, silnik Lexbor).
+
+selectolax buduje drzewo i wykonuje selektory CSS w C, przez co
+parsowanie stron katalogów jest kilkukrotnie szybsze niż BeautifulSoup + lxml.
+"""
+import codecs
+import re
+from typing import Optional, Sequence, Union
+
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+
+# Kodowanie zadeklarowane w <meta charset> lub <meta http-equiv="Content-Type">
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.I)
+
+
+def parse(html: Union[str, bytes]) -> LexborHTMLParser:
+    """Parsuje dokument HTML (str lub bajty UTF-8)."""
+    return LexborHTMLParser(html)
+
+
+def page_html(body: bytes, charset: Optional[str] = None) -> Union[str, bytes]:
+    """
+    Przygotowuje treść strony dla parse().
+
+    Lexbor traktuje bajty zawsze jako UTF-8 i pomija <meta charset>.
+    Strony UTF-8 zostają bajtami (bez kopii jako str); strony w innym
+    kodowaniu (z nagłówka Content-Type lub <meta> w pierwszym 1 KB,
+    np. iso-8859-2) są dekodowane, żeby polskie znaki nie zostały zniekształcone.
+
+    Args:
+        body: Surowa treść odpowiedzi
+        charset: Kodowanie z nagłówka Content-Type (response.charset_encoding)
+    """
+    if not charset:
+        match = _META_CHARSET_RE.search(body, 0, 1024)
+        if not match:
+            return body
+        charset = match.group(1).decode("ascii")
+
+    try:
+        if codecs.lookup(charset).name == "utf-8":
+            return body
+        return body.decode(charset, "replace")
+    except LookupError:
+        # Nieznane kodowanie - zostaje domyślne UTF-8
+        return body
+
+
+def attr(node: LexborNode, name: str) -> str:
+    """Zwraca wartość atrybutu lub pusty napis (także dla atrybutów bez wartości)."""
+    return node.attributes.get(name) or ""
+
+
+def first_match(node, selectors: Sequence[str]) -> Optional[LexborNode]:
+    """
+    Zwraca pierwszy element pasujący do selektorów w kolejności priorytetu.
+
+    Zamiast jednej listy "a, b, c" (każdy węzeł sprawdzany względem
+    wszystkich wariantów) selektory są próbowane po kolei - zwykle
+    trafia już pierwszy, najtańszy wariant.
+    """
+    for selector in selectors:
+        match = node.css_first(selector)
+        if match is not None:
+            return match
+    return None
+
+
+# Blok z danymi kontaktowymi na stronie profilu firmy
+_CONTACT_SELECTOR = "[itemtype*='LocalBusiness'], .contact-info, #contact, main"
+
+
+def contact_html(tree: LexborHTMLParser, html: Union[str, bytes]) -> str:
+    """
+    Zwraca HTML bloku kontaktowego strony (do wyszukiwania email/telefonu).
+
+    Nawigacja, stopka i skrypty nie są skanowane regexami; gdy bloku
+    nie ma, zwracany jest cały dokument (bajty dekodowane jako UTF-8).
+    """
+    node = tree.css_first(_CONTACT_SELECTOR)
+    if node is not None:
+        return node.html
+    if isinstance(html, bytes):
+        return html.decode("utf-8", "replace")
+    return html
@@ -2,16 +2,37 @@
 Walidatory i ekstraktory danych kontaktowych
 """
 import re
+from functools import lru_cache
 from typing import List, Set
 from urllib.parse import urlparse
 
+# Wyrażenia kompilowane raz przy imporcie - funkcje są wołane dla każdej firmy
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_EMAIL_FULL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_NONDIGIT_RE = re.compile(r'\D')
+
+# Popularne fałszywe/przykładowe adresy
+_FAKE_EMAIL_PARTS = ('example.com', 'test.com', 'email@', '@email')
+
+# Wzorce dla polskich numerów telefonów: (napis, bez którego wzorzec nie
+# może pasować, wzorzec). Wzorce z +48 pomijamy bez skanowania tekstu,
+# jeśli "+48" w nim nie ma
+_PHONE_PATTERNS = [
+    ("+48", re.compile(r'\+48\s*\d{3}\s*\d{3}\s*\d{3}')),  # +48 123 456 789
+    ("+48", re.compile(r'\+48\s*\d{2}\s*\d{3}\s*\d{2}\s*\d{2}')),  # +48 12 345 67 89
+    ("(+48)", re.compile(r'\(\+48\)\s*\d{3}\s*\d{3}\s*\d{3}')),  # (+48) 123 456 789
+    ("48", re.compile(r'48\s*\d{3}\s*\d{3}\s*\d{3}')),  # 48 123 456 789
+    (None, re.compile(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{3}')),  # 123-456-789, 123.456.789, 123 456 789
+    (None, re.compile(r'\d{2}[-.\s]?\d{3}[-.\s]?\d{2}[-.\s]?\d{2}')),  # 12-345-67-89
+    (None, re.compile(r'\d{9}')),  # 123456789
+]
+
 
 def is_valid_email(email: str) -> bool:
     """Sprawdza czy email jest poprawny."""
     if not email:
         return False
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email.lower()))
+    return bool(_EMAIL_FULL_RE.match(email.lower()))
 
 
 def is_valid_phone(phone: str) -> bool:
@@ -19,7 +40,7 @@ def is_valid_phone(phone: str) -> bool:
     if not phone:
         return False
     # Usuń wszystko poza cyframi
-    digits = re.sub(r'\D', '', phone)
+    digits = _NONDIGIT_RE.sub('', phone)
     # Polski numer: 9 cyfr lub 11 z kodem kraju
     return len(digits) in [9, 11, 12]
 
@@ -28,15 +49,15 @@ def extract_emails(text: str) -> List[str]:
     """Wyciąga wszystkie adresy email z tekstu."""
     if not text:
         return []
-    pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    emails = re.findall(pattern, text.lower())
+    # Tekst jest już małymi literami - znalezione adresy też
+    emails = _EMAIL_RE.findall(text.lower())
     # Filtruj i usuń duplikaty
     valid_emails = []
     seen = set()
     for email in emails:
-        if email not in seen and is_valid_email(email):
+        if email not in seen and _EMAIL_FULL_RE.match(email):
             # Wyklucz popularne fałszywe emaile
-            if not any(fake in email for fake in ['example.com', 'test.com', 'email@', '@email']):
+            if not any(fake in email for fake in _FAKE_EMAIL_PARTS):
                 valid_emails.append(email)
                 seen.add(email)
     return valid_emails
@@ -47,23 +68,13 @@ def extract_phones(text: str) -> List[str]:
     if not text:
         return []
 
-    # Wzorce dla polskich numerów telefonów
-    patterns = [
-        r'\+48\s*\d{3}\s*\d{3}\s*\d{3}',  # +48 123 456 789
-        r'\+48\s*\d{2}\s*\d{3}\s*\d{2}\s*\d{2}',  # +48 12 345 67 89
-        r'\(\+48\)\s*\d{3}\s*\d{3}\s*\d{3}',  # (+48) 123 456 789
-        r'48\s*\d{3}\s*\d{3}\s*\d{3}',  # 48 123 456 789
-        r'\d{3}[-.\s]?\d{3}[-.\s]?\d{3}',  # 123-456-789, 123.456.789, 123 456 789
-        r'\d{2}[-.\s]?\d{3}[-.\s]?\d{2}[-.\s]?\d{2}',  # 12-345-67-89
-        r'\d{9}',  # 123456789
-    ]
-
     phones = set()
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        for match in matches:
+    for required, pattern in _PHONE_PATTERNS:
+        if required and required not in text:
+            continue
+        for match in pattern.findall(text):
             # Normalizuj
-            normalized = re.sub(r'\D', '', match)
+            normalized = _NONDIGIT_RE.sub('', match)
             if len(normalized) >= 9:
                 # Weź ostatnie 9 cyfr (właściwy numer bez kodu kraju)
                 if len(normalized) > 9:
@@ -73,26 +84,11 @@ def extract_phones(text: str) -> List[str]:
     return list(phones)
 
 
-def extract_social_media(text: str, html: str = None) -> dict:
-    """
-    Wyciąga linki do social media z tekstu/HTML.
-
-    Returns:
-        Dict z kluczami: facebook, instagram, linkedin, twitter
-    """
-    social = {
-        "facebook": None,
-        "instagram": None,
-        "linkedin": None,
-        "twitter": None,
-    }
-
-    source = f"{text} {html}" if html else text
-    if not source:
-        return social
-
-    # Wzorce dla różnych platform
-    patterns = {
+# Wzorce dla różnych platform social media. Domena musi zaczynać się
+# od granicy nazwy hosta - "fedex.com" czy "dropbox.com" to nie x.com
+_SOCIAL_PATTERNS = {
+    platform: [re.compile(r'(?<![\w-])' + p, re.IGNORECASE) for p in platform_patterns]
+    for platform, platform_patterns in {
         "facebook": [
             r'(?:https?://)?(?:www\.)?facebook\.com/[a-zA-Z0-9._-]+/?',
             r'(?:https?://)?(?:www\.)?fb\.com/[a-zA-Z0-9._-]+/?',
@@ -106,11 +102,34 @@ def extract_social_media(text: str, html: str = None) -> dict:
         "twitter": [
             r'(?:https?://)?(?:www\.)?(?:twitter|x)\.com/[a-zA-Z0-9._-]+/?',
         ],
-    }
+    }.items()
+}
+
+# Linki, które mogą prowadzić do profili social media (wstępny filtr -
+# domenę dokładnie sprawdzają wzorce w _match_social)
+_SOCIAL_LINK_SELECTOR = (
+    "a[href*='facebook.com'], a[href*='fb.com'], a[href*='instagram.com'], "
+    "a[href*='linkedin.com'], a[href*='twitter.com'], "
+    "a[href*='//x.com'], a[href*='.x.com']"
+)
 
-    for platform, platform_patterns in patterns.items():
+
+def _match_social(social: dict, *sources: str) -> None:
+    """
+    Uzupełnia brakujące platformy w `social` pierwszym pasującym URL.
+
+    Kilka źródeł jest przeszukiwanych po kolei (jak gdyby były sklejone),
+    bez budowania ich połączonej kopii.
+    """
+    for platform, platform_patterns in _SOCIAL_PATTERNS.items():
+        if social[platform]:
+            continue
         for pattern in platform_patterns:
-            match = re.search(pattern, source, re.IGNORECASE)
+            match = None
+            for source in sources:
+                match = pattern.search(source)
+                if match:
+                    break
             if match:
                 url = match.group(0)
                 # Dodaj https:// jeśli brakuje
@@ -119,13 +138,92 @@ def extract_social_media(text: str, html: str = None) -> dict:
                 social[platform] = url
                 break
 
+
+def extract_social_media(text: str, html: str = None) -> dict:
+    """
+    Wyciąga linki do social media z tekstu/HTML.
+
+    Jeśli strona jest już sparsowana, szybsze jest
+    extract_social_media_from_tree().
+
+    Returns:
+        Dict z kluczami: facebook, instagram, linkedin, twitter
+    """
+    social = {
+        "facebook": None,
+        "instagram": None,
+        "linkedin": None,
+        "twitter": None,
+    }
+
+    sources = [source for source in (text, html) if source]
+    if not sources:
+        return social
+
+    _match_social(social, *sources)
     return social
 
 
+def extract_social_media_from_tree(tree) -> dict:
+    """
+    Wyciąga linki do social media z już sparsowanego drzewa HTML.
+
+    Sprawdza tylko atrybuty href linków zamiast całego dokumentu.
+
+    Args:
+        tree: Drzewo selectolax (lub węzeł) z metodą css()
+
+    Returns:
+        Dict z kluczami: facebook, instagram, linkedin, twitter
+    """
+    social = {
+        "facebook": None,
+        "instagram": None,
+        "linkedin": None,
+        "twitter": None,
+    }
+
+    for link in tree.css(_SOCIAL_LINK_SELECTOR):
+        href = link.attributes.get("href")
+        if href:
+            _match_social(social, href)
+        if all(social.values()):
+            break
+
+    return social
+
+
+# Domeny, które NIE są stronami firmowymi (dopasowanie fragmentu nazwy hosta)
+_EXCLUDED_DOMAINS = [
+    'facebook.com', 'fb.com',
+    'instagram.com',
+    'twitter.com', 'x.com',
+    'linkedin.com',
+    'youtube.com',
+    'tiktok.com',
+    'google.com', 'google.pl',
+    'panoramafirm.pl',
+    'pkt.pl',
+    'aleo.com',
+    'gowork.pl',
+    'olx.pl',
+    'allegro.pl',
+    'zumi.pl',
+    'yelp.com',
+    'tripadvisor.',
+    'booking.com',
+]
+_EXCLUDED_EXACT = frozenset(_EXCLUDED_DOMAINS)
+_EXCLUDED_RE = re.compile("|".join(map(re.escape, _EXCLUDED_DOMAINS)))
+
+
+@lru_cache(maxsize=4096)
 def is_valid_website(url: str) -> bool:
     """
     Sprawdza czy URL wygląda na prawdziwą stronę firmową.
     Wyklucza social media, katalogi firm, itp.
+
+    Wynik jest cache'owany - te same linki powtarzają się na wielu stronach.
     """
     if not url:
         return False
@@ -137,28 +235,10 @@ def is_valid_website(url: str) -> bool:
     except Exception:
         return False
 
-    # Domeny, które NIE są stronami firmowymi
-    excluded_domains = [
-        'facebook.com', 'fb.com',
-        'instagram.com',
-        'twitter.com', 'x.com',
-        'linkedin.com',
-        'youtube.com',
-        'tiktok.com',
-        'google.com', 'google.pl',
-        'panoramafirm.pl',
-        'pkt.pl',
-        'aleo.com',
-        'gowork.pl',
-        'olx.pl',
-        'allegro.pl',
-        'zumi.pl',
-        'yelp.com',
-        'tripadvisor.',
-        'booking.com',
-    ]
-
-    return not any(excluded in domain for excluded in excluded_domains)
+    # Najczęstszy przypadek (dokładnie ta domena) bez skanowania napisu
+    if domain.removeprefix('www.') in _EXCLUDED_EXACT:
+        return False
+    return not _EXCLUDED_RE.search(domain)
 
 
 def has_website(business_data: dict) -> bool:
@@ -8,26 +8,64 @@ import sys
 import json
 import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
 from flask import Flask, render_template, request, jsonify, send_file, Response
+from flask.json.provider import DefaultJSONProvider
 
-# Dodaj katalog główny do ścieżki
-sys.path.insert(0, str(Path(__file__).parent.parent))
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Dodaj katalog nadrzędny pakietu szczecin_scraper do ścieżki
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from szczecin_scraper.config import (
+    INDUSTRIES, OUTPUT_DIR, CITY, WEBSITE_CHECK_WORKERS, MAX_SCAN_JOBS
+)
+from szczecin_scraper.scrapers.panorama_firm import PanoramaFirmScraper
+from szczecin_scraper.scrapers.website_checker import WebsiteChecker
+from szczecin_scraper.utils.exporter import DataExporter
+from szczecin_scraper.utils.helpers import random_delay, make_dedup_key
+from szczecin_scraper.templates.messages import MessageGenerator
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON aplikacji przez orjson (parsowanie request.json i jsonify).
+
+    Duże listy firm w /api/messages/generate są parsowane kilka razy
+    szybciej niż przez moduł json. Klucze sortowane jak w domyślnym
+    providerze Flaska.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
-from config import INDUSTRIES, OUTPUT_DIR, CITY
-from scrapers.panorama_firm import PanoramaFirmScraper
-from scrapers.website_checker import WebsiteChecker
-from utils.exporter import DataExporter
-from utils.helpers import random_delay
-from templates.messages import MessageGenerator
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
+# Przechowywanie zadań skanowania - najdawniej używane są usuwane
+# po przekroczeniu MAX_SCAN_JOBS (pamięć nie rośnie z każdym skanem)
+scan_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
 
-# Przechowywanie zadań skanowania
-scan_jobs = {}
+# Liczba firm serializowanych naraz przy strumieniowaniu wyników
+RESULTS_CHUNK = 256
 
 
 class ScanJob:
@@ -41,6 +79,7 @@ class ScanJob:
         self.progress = 0
         self.current_industry = ""
         self.businesses = []
+        self.total_found = 0
         self.businesses_without_website = []
         self.error = None
         self.output_file = None
@@ -53,7 +92,7 @@ class ScanJob:
             "status": self.status,
             "progress": self.progress,
             "current_industry": self.current_industry,
-            "total_found": len(self.businesses),
+            "total_found": self.total_found or len(self.businesses),
             "without_website": len(self.businesses_without_website),
             "error": self.error,
             "output_file": self.output_file,
@@ -64,6 +103,7 @@ class ScanJob:
 
 def run_scan(job: ScanJob):
     """Wykonuje skanowanie w tle."""
+    scraper = checker = None
     try:
         job.status = "running"
         job.started_at = datetime.now()
@@ -84,14 +124,16 @@ def run_scan(job: ScanJob):
                     city=CITY,
                     max_results=job.max_results
                 ):
-                    name_key = business.name.lower().strip()
+                    # 16-bajtowy skrót zamiast pełnej nazwy
+                    name_key = make_dedup_key(business.name)
                     if name_key in seen_names:
                         continue
 
                     seen_names.add(name_key)
-                    biz_dict = business.to_dict()
-                    biz_dict["industry"] = industry
-                    job.businesses.append(biz_dict)
+                    # Obiekty Business (slots) - słowniki powstają dopiero
+                    # dla firm, które trafią do wyników
+                    business.industry = industry
+                    job.businesses.append(business)
 
             except Exception as e:
                 print(f"Error scanning {industry}: {e}")
@@ -101,24 +143,38 @@ def run_scan(job: ScanJob):
         job.current_industry = "Weryfikacja stron..."
         job.progress = 85
 
-        for i, biz in enumerate(job.businesses):
-            website = biz.get("website", "")
-            if not website:
-                biz["has_website"] = False
+        to_check = []
+        for biz in job.businesses:
+            if biz.website:
+                to_check.append(biz)
             else:
-                try:
-                    status = checker.check_website(website)
-                    biz["has_website"] = status.is_active and status.is_company_site
-                except Exception:
-                    biz["has_website"] = False
-
-            if i % 5 == 0:
-                job.progress = 85 + int((i / len(job.businesses)) * 10)
+                biz.has_website = False
+
+        # Sprawdzanie stron to czekanie na sieć - wątki nakładają je na siebie
+        if to_check:
+            with ThreadPoolExecutor(max_workers=WEBSITE_CHECK_WORKERS) as pool:
+                futures = {
+                    pool.submit(checker.check_website, biz.website): biz
+                    for biz in to_check
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    biz = futures[future]
+                    try:
+                        status = future.result()
+                        biz.has_website = status.is_active and status.is_company_site
+                    except Exception:
+                        biz.has_website = False
+
+                    if done % 5 == 0:
+                        job.progress = 85 + int((done / len(to_check)) * 10)
 
         # Filtruj firmy bez stron
         job.businesses_without_website = [
-            b for b in job.businesses if not b.get("has_website", True)
+            b.to_dict() for b in job.businesses if not b.has_website
         ]
+        # Pełna lista nie jest już potrzebna - zostaje tylko liczba firm
+        job.total_found = len(job.businesses)
+        job.businesses = []
 
         # Eksportuj wyniki
         job.current_industry = "Eksport wyników..."
@@ -140,6 +196,35 @@ def run_scan(job: ScanJob):
         job.status = "error"
         job.error = str(e)
         job.completed_at = datetime.now()
+    finally:
+        # Klienci HTTP zamykani także po błędzie skanowania lub weryfikacji
+        if checker:
+            checker.close()
+        if scraper:
+            scraper.close()
+
+
+def _store_job(job: ScanJob) -> None:
+    """Zapisuje zadanie, usuwając najdawniej używane ponad limit."""
+    with _jobs_lock:
+        while len(scan_jobs) >= MAX_SCAN_JOBS:
+            # Najpierw zakończone zadania; trwające tylko gdy nie ma innych
+            victim = next(
+                (key for key, old in scan_jobs.items()
+                 if old.status in ("completed", "error")),
+                next(iter(scan_jobs))
+            )
+            del scan_jobs[victim]
+        scan_jobs[job.job_id] = job
+
+
+def _get_job(job_id: str):
+    """Zwraca zadanie (lub None) i oznacza je jako ostatnio używane."""
+    with _jobs_lock:
+        job = scan_jobs.get(job_id)
+        if job is not None:
+            scan_jobs.move_to_end(job_id)
+        return job
 
 
 @app.route("/")
@@ -161,7 +246,7 @@ def start_scan():
     # Utwórz nowe zadanie
     job_id = str(uuid.uuid4())[:8]
     job = ScanJob(job_id, industries, max_results)
-    scan_jobs[job_id] = job
+    _store_job(job)
 
     # Uruchom skanowanie w tle
     thread = threading.Thread(target=run_scan, args=(job,))
@@ -174,7 +259,7 @@ def start_scan():
 @app.route("/api/scan/status/<job_id>")
 def scan_status(job_id):
     """Zwraca status skanowania."""
-    job = scan_jobs.get(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({"error": "Nie znaleziono zadania"}), 404
 
@@ -184,20 +269,30 @@ def scan_status(job_id):
 @app.route("/api/scan/results/<job_id>")
 def scan_results(job_id):
     """Zwraca wyniki skanowania."""
-    job = scan_jobs.get(job_id)
+    job = _get_job(job_id)
     if not job:
         return jsonify({"error": "Nie znaleziono zadania"}), 404
 
-    return jsonify({
-        "businesses": job.businesses_without_website,
-        "total": len(job.businesses_without_website)
-    })
+    businesses = job.businesses_without_website
+
+    # Odpowiedź wysyłana partiami - cały JSON nie powstaje w pamięci naraz
+    def generate():
+        yield '{"businesses":['
+        for start in range(0, len(businesses), RESULTS_CHUNK):
+            chunk = ",".join(
+                app.json.dumps(biz)
+                for biz in businesses[start:start + RESULTS_CHUNK]
+            )
+            yield chunk if start == 0 else "," + chunk
+        yield f'],"total":{len(businesses)}}}\n'
+
+    return Response(generate(), mimetype="application/json")
 
 
 @app.route("/api/scan/download/<job_id>")
 def download_results(job_id):
     """Pobiera plik z wynikami."""
-    job = scan_jobs.get(job_id)
+    job = _get_job(job_id)
     if not job or not job.output_file:
         return jsonify({"error": "Brak pliku do pobrania"}), 404
 
@@ -223,10 +318,7 @@ def generate_messages():
         sender_website=sender.get("website", "https://webstudio.pl")
     )
 
-    messages = []
-    for biz in businesses:
-        msg = generator.generate_all_messages(biz)
-        messages.append(msg)
+    messages = generator.generate_batch(businesses)
 
     return jsonify({"messages": messages})
 